@@ -0,0 +1,66 @@
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from models.application import StatusEnum
+from utils.response import BSONJSONResponse
+from utils.transform import objectid_to_str
+
+PAGE_SIZE = 100
+
+
+def build_page(page_size):
+    """A /data/job_posts-like page, documents shaped as Motor returns them."""
+    now = datetime.now(timezone.utc)
+    return {
+        "data": [
+            {
+                "_id": ObjectId(),
+                "employer_id": ObjectId(),
+                "job_ad_title": f"Job {index}",
+                "job_description": "lorem ipsum " * 40,
+                "status": random.choice(list(StatusEnum)),
+                "key_skills": [{"skill": f"skill {skill}", "years": skill} for skill in range(5)],
+                "languages_required": ["English", "French", "Kinyarwanda"],
+                "created_at": now - timedelta(days=index),
+            }
+            for index in range(page_size)
+        ],
+        "total_count": 500000,
+        "current_page": 1,
+    }
+
+
+def previous_encoding(page):
+    # objectid_to_str in the service, jsonable_encoder in FastAPI, then the stdlib json module
+    return JSONResponse(jsonable_encoder(objectid_to_str(page))).body
+
+
+def bson_encoding(page):
+    return BSONJSONResponse(page).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the response encodings on pages of documents.")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--number", type=int, default=200, help="Encodings per measurement")
+    args = parser.parse_args()
+
+    page = build_page(args.page_size)
+    results = {}
+    for name, encode in (("objectid_to_str + jsonable_encoder", previous_encoding), ("BSONJSONResponse", bson_encoding)):
+        best = min(timeit.repeat(lambda: encode(page), number=args.number, repeat=5)) / args.number
+        results[name] = best
+        print(f"{name:36} {best * 1e6:9.1f} us per {args.page_size}-document page, {len(encode(page))} bytes")
+
+    baseline, optimized = results.values()
+    print(f"speedup: {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,50 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     # Database Config
     db_url: str
+    db_ensure_indexes: bool = True
+    db_max_pool_size: int = 100
+    db_min_pool_size: int = 10
+    db_compressors: str = "zstd,zlib"
+    db_server_selection_timeout_ms: int = 5000
+    db_timeout_ms: int | None = None  # Per-operation time limit, also sent to the server as maxTimeMS
+    db_command_monitoring: bool = True
+    db_slow_command_ms: float = 100
+    db_measure_reply_bytes: bool = True  # Sizing a reply re-encodes it, on the Motor executor thread of the command
+    query_timeout_seconds: float | None = 10  # Time limit of the concurrent queries of the listing endpoints
 
     # JWT Config
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
 
+    # "database" loads the user on every request, "claims" trusts the id/email/role claims of the verified token
+    auth_mode: Literal["database", "claims"] = "database"
+
+    # Password hashing Config
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 256
+
+    # Principal cache Config
+    principal_cache_ttl_seconds: float = 30
+    principal_cache_size: int = 10000
+
+    # Job catalog Config, the in-process index of the /candidate/jobs enum filters
+    job_catalog_enabled: bool = True
+    job_catalog_sync_seconds: float = 30
+
+    # Pagination total count cache Config
+    count_cache_ttl_seconds: float = 10
+    count_cache_size: int = 10000
+
+    # /candidate/jobs response cache Config
+    job_search_cache_ttl_seconds: float = 10
+    job_search_cache_size: int = 1000
+
     class Config:
         env_file = ".env"
 
@@ -1,13 +1,103 @@
+import asyncio
+import logging
+
 import motor.motor_asyncio
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
 
 from core.config import settings
+from core.monitoring import CommandTimingListener
+
+DATABASE_NAME = 'job_recruitment_system'
 
-client = motor.motor_asyncio.AsyncIOMotorClient(settings.db_url)
-db = client.get_database('job_recruitment_system')
+# connect=False defers every network activity to the first operation, the app lifespan warms up and closes the pool
+client = motor.motor_asyncio.AsyncIOMotorClient(
+    settings.db_url,
+    connect=False,
+    maxPoolSize=settings.db_max_pool_size,
+    minPoolSize=settings.db_min_pool_size,
+    compressors=settings.db_compressors or None,
+    serverSelectionTimeoutMS=settings.db_server_selection_timeout_ms,
+    timeoutMS=settings.db_timeout_ms,
+    event_listeners=[CommandTimingListener()] if settings.db_command_monitoring else [],
+)
+db = client.get_database(DATABASE_NAME)
 user_collection = db.get_collection('users')
 candidate_profile = db.get_collection('candidate_profiles')
 employer_profile = db.get_collection('employer_profiles')
 job_posts = db.get_collection("job_posts")
 applications = db.get_collection("applications")
 
+logger = logging.getLogger(__name__)
+
+# Case-insensitive string comparison, the *_ci indexes are built with it and only serve queries that run with it
+CASE_INSENSITIVE = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+# Indexes backing the hot predicates of the services, applied at startup and checked by database_indexes.py.
+# The listings are sorted and keyset-paginated on _id, their filter indexes end with it so that a page is an index
+# range, without an in-memory sort.
+INDEXES = {
+    'users': [
+        # Login, authentication and registration duplicate checks
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    'candidate_profiles': [
+        IndexModel([("candidate_id", ASCENDING)], name="candidate_id"),
+    ],
+    'employer_profiles': [
+        IndexModel([("employer_id", ASCENDING)], name="employer_id"),
+    ],
+    'job_posts': [
+        # Employer listing of their own job posts
+        IndexModel([("employer_id", ASCENDING), ("_id", ASCENDING)], name="employer_id_id"),
+        IndexModel([("employer_id", ASCENDING), ("job_ad_title", ASCENDING), ("_id", ASCENDING)],
+                   name="employer_id_job_ad_title_id_ci", collation=CASE_INSENSITIVE),
+        # /candidate/jobs filters
+        IndexModel([("region", ASCENDING), ("experience_level", ASCENDING), ("offered_salary", ASCENDING),
+                    ("_id", ASCENDING)], name="region_experience_level_offered_salary_id"),
+        IndexModel([("city", ASCENDING), ("_id", ASCENDING)], name="city_id_ci", collation=CASE_INSENSITIVE),
+        IndexModel([("job_ad_title", ASCENDING), ("_id", ASCENDING)], name="job_ad_title_id_ci",
+                   collation=CASE_INSENSITIVE),
+        IndexModel([("experience_level", ASCENDING), ("_id", ASCENDING)], name="experience_level_id"),
+        IndexModel([("offered_salary", ASCENDING), ("_id", ASCENDING)], name="offered_salary_id"),
+        # Keyword search (q=), matches in the title rank above the skills and the descriptions
+        IndexModel(
+            [("job_ad_title", TEXT), ("key_skills", TEXT), ("job_description", TEXT),
+             ("required_profile_description", TEXT)],
+            name="job_search_text",
+            weights={"job_ad_title": 10, "key_skills": 5, "job_description": 2, "required_profile_description": 1},
+        ),
+    ],
+    'applications': [
+        # Candidate applications listing, and the already-applied check
+        IndexModel([("candidate_id", ASCENDING), ("_id", ASCENDING)], name="candidate_id_id"),
+        IndexModel([("candidate_id", ASCENDING), ("job_id", ASCENDING)], name="candidate_id_job_id"),
+        # Employer view of the applications of a job post, by status
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING)], name="job_id_status"),
+    ],
+}
+
+
+async def warm_up_pool():
+    """Open db_min_pool_size connections up front, so the first requests don't pay for the handshakes."""
+    try:
+        await asyncio.gather(*(db.command("ping") for _ in range(max(settings.db_min_pool_size, 1))))
+    except PyMongoError as e:
+        logger.error("Could not warm up the database connection pool: %s", e)
+
+
+def close_client():
+    client.close()
+
 
+async def ensure_indexes():
+    """Create the declared indexes, existing ones with the same definition are left untouched."""
+    for collection_name, indexes in INDEXES.items():
+        try:
+            await db.get_collection(collection_name).create_indexes(indexes)
+        except ServerSelectionTimeoutError as e:
+            logger.error("Could not reach the database to create the indexes: %s", e)
+            return
+        except PyMongoError as e:
+            logger.error("Could not create the indexes of %s: %s", collection_name, e)
@@ -0,0 +1,45 @@
+import threading
+from collections import defaultdict
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and per-route totals, shared by the event loop and the executor threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._gauges = defaultdict(int)
+        self._routes = defaultdict(lambda: defaultdict(float))
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def adjust_gauge(self, name: str, delta: int):
+        with self._lock:
+            self._gauges[name] += delta
+
+    def add_route_totals(self, route: str, **values):
+        with self._lock:
+            totals = self._routes[route]
+            for name, value in values.items():
+                totals[name] += value
+
+    def set_gauge(self, name: str, value: int):
+        with self._lock:
+            self._gauges[name] = value
+
+    def gauge(self, name: str) -> int:
+        with self._lock:
+            return self._gauges[name]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "routes": {route: dict(totals) for route, totals in self._routes.items()},
+            }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,105 @@
+import contextvars
+import logging
+import threading
+import time
+
+import bson
+from fastapi import Request
+from pymongo import monitoring
+
+from core.config import settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Database totals of the request being handled. Motor copies the context into its executor threads, which is
+# where pymongo publishes the command events.
+current_request_stats = contextvars.ContextVar("current_request_stats", default=None)
+
+
+class RequestDatabaseStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = 0
+        self.duration_ms = 0.0
+        self.documents = 0
+        self.bytes = 0
+
+    def record(self, duration_ms: float, documents: int, size: int):
+        with self._lock:
+            self.commands += 1
+            self.duration_ms += duration_ms
+            self.documents += documents
+            self.bytes += size
+
+
+def reply_documents(reply) -> int:
+    cursor = reply.get("cursor")
+    if cursor is not None:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    return reply.get("n", 0)
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """Attribute the duration, documents and bytes of every command to the request that issued it."""
+
+    def __init__(self):
+        self._started = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        self._started[(event.connection_id, event.request_id)] = (current_request_stats.get(), event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        stats, command = self._started.pop((event.connection_id, event.request_id), (None, None))
+        # pymongo only hands over the decoded reply, it's re-encoded to be sized. Listeners run on the thread that
+        # ran the command, a Motor executor thread, the event loop only pays for the GIL time it takes.
+        size = len(bson.encode(event.reply)) if settings.db_measure_reply_bytes else 0
+        self._record(event, stats, command, reply_documents(event.reply), size)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        stats, command = self._started.pop((event.connection_id, event.request_id), (None, None))
+        self._record(event, stats, command, 0, 0)
+
+    @staticmethod
+    def _record(event, stats, command, documents, size):
+        duration_ms = event.duration_micros / 1000
+        if stats is not None:
+            stats.record(duration_ms, documents, size)
+
+        if duration_ms >= settings.db_slow_command_ms and command is not None:
+            logger.warning(
+                "Slow %s on %s took %.1f ms: %s",
+                event.command_name,
+                command.get(event.command_name),
+                duration_ms,
+                command.get("pipeline", command.get("filter", command.get("query"))),
+            )
+
+
+async def database_timing_middleware(request: Request, call_next):
+    """Expose the database share of each request as Server-Timing and aggregate it per route in the metrics."""
+    stats = RequestDatabaseStats()
+    token = current_request_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_stats.reset(token)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    route = request.scope.get("route")
+    metrics.add_route_totals(
+        f"{request.method} {route.path if route is not None else 'unmatched'}",
+        requests=1,
+        duration_ms=total_ms,
+        db_commands=stats.commands,
+        db_duration_ms=stats.duration_ms,
+        db_documents=stats.documents,
+        db_bytes=stats.bytes,
+    )
+    size = f", {stats.bytes} bytes" if settings.db_measure_reply_bytes else ""
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.duration_ms:.1f};desc="{stats.commands} commands, {stats.documents} docs{size}", '
+        f'total;dur={total_ms:.1f}'
+    )
+    return response
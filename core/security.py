@@ -1,7 +1,11 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Annotated
 
 import jwt
+from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import InvalidTokenError, ExpiredSignatureError
@@ -10,10 +14,22 @@ from starlette import status
 
 from core.config import settings
 from core.database import user_collection
+from core.metrics import metrics
+from utils.cache import TTLCache
 
 password_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login')
 
+# bcrypt takes ~200 ms per call, so it runs on its own bounded pool instead of the event loop
+password_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers,
+                                       thread_name_prefix='password-hash')
+PASSWORD_QUEUE_DEPTH = 'password_hash.queue_depth'
+PASSWORD_RUNNING = 'password_hash.running'
+
+# Authenticated users keyed by email, so most requests skip the users lookup. No endpoint changes or deletes a user
+# document yet, the first one to do so (role, password, deletion) has to call principal_cache.invalidate(email).
+principal_cache = TTLCache(max_size=settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds)
+
 
 # Create hash password
 def hash_password(password) -> str:
@@ -25,6 +41,42 @@ def verify_password(plain_password, hashed_password) -> bool:
     return password_context.verify(plain_password, hashed_password)
 
 
+async def run_password_job(function, *args):
+    """Run a bcrypt call on the password executor, rejecting it when too many calls are already queued."""
+    if metrics.gauge(PASSWORD_QUEUE_DEPTH) >= settings.password_hash_max_queue:
+        metrics.increment('password_hash.rejected')
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please try again shortly.",
+        )
+
+    def job():
+        metrics.adjust_gauge(PASSWORD_QUEUE_DEPTH, -1)
+        metrics.adjust_gauge(PASSWORD_RUNNING, 1)
+        try:
+            return function(*args)
+        finally:
+            metrics.adjust_gauge(PASSWORD_RUNNING, -1)
+
+    def release_if_cancelled(future):
+        # A job cancelled before it started never ran, so it has to leave the queue here
+        if future.cancelled():
+            metrics.adjust_gauge(PASSWORD_QUEUE_DEPTH, -1)
+
+    metrics.adjust_gauge(PASSWORD_QUEUE_DEPTH, 1)
+    future = password_executor.submit(job)
+    future.add_done_callback(release_if_cancelled)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password) -> str:
+    return await run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await run_password_job(verify_password, plain_password, hashed_password)
+
+
 async def create_jwt_token(data: dict, expire_delta: timedelta | None = None):
     to_encode = data.copy()
     if expire_delta:
@@ -36,6 +88,26 @@ async def create_jwt_token(data: dict, expire_delta: timedelta | None = None):
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
+async def load_principal(email: str):
+    user = principal_cache.get(email)
+    if user is not None:
+        metrics.increment('principal_cache.hits')
+        return user
+
+    metrics.increment('principal_cache.misses')
+    user = await user_collection.find_one({"email": email}, {"password": 0})
+    if user is not None:
+        principal_cache.set(email, user)
+    return user
+
+
+def principal_from_claims(payload: dict):
+    """Build the principal from the verified token claims, None when the token lacks one of them."""
+    if not all(payload.get(claim) for claim in ("id", "email", "role")):
+        return None
+    return {"_id": ObjectId(payload["id"]), "email": payload["email"], "role": payload["role"]}
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,26 +124,44 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         email: str = payload.get("email")
         if email is None:
             raise credentials_exception
-        user = await user_collection.find_one({"email": email})
+        user = principal_from_claims(payload) if settings.auth_mode == "claims" else None
+        if user is None:
+            user = await load_principal(email)
         if user is None:
             raise credentials_exception
     except ExpiredSignatureError:
         raise expired_token_exception
-    except InvalidTokenError:
+    except (InvalidTokenError, InvalidId):
         raise credentials_exception
 
     return user
 
 
-async def check_candidate_role(token: Annotated[str, Depends(oauth2_scheme)]):
-    user = await get_current_user(token)
-    if user['role'] != 'candidate':
-        raise HTTPException(status_code=403, detail="You are not authorized to perform this action")
-    return user
+async def get_current_user_document(user: Annotated[dict, Depends(get_current_user)]):
+    """The stored user document of the principal, without its password, for the endpoints showing profile data.
+
+    Database mode principals already are that document, claims mode ones only carry the token claims.
+    """
+    if "first_name" in user:
+        return user
+    user_document = await user_collection.find_one({"_id": user["_id"]}, {"password": 0})
+    if user_document is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return user_document
 
 
-async def check_employer_role(token: Annotated[str, Depends(oauth2_scheme)]):
-    user = await get_current_user(token)
-    if user['role'] != 'employer':
+# Role checks depend on get_current_user instead of calling it, so FastAPI resolves the principal once per
+# request and shares it with the router dependencies and every endpoint asking for the current user.
+def ensure_role(user, role: str):
+    if user['role'] != role:
         raise HTTPException(status_code=403, detail="You are not authorized to perform this action")
     return user
+
+
+async def check_candidate_role(user: Annotated[dict, Depends(get_current_user)]):
+    return ensure_role(user, 'candidate')
+
+
+async def check_employer_role(user: Annotated[dict, Depends(get_current_user)]):
+    return ensure_role(user, 'employer')
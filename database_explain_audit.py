@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import contextvars
+import sys
+from typing import Callable, NamedTuple
+
+import pymongo
+from bson import json_util
+from pymongo import monitoring
+
+from core.config import settings
+
+# The commands are captured from the service methods themselves rather than copied out of them, so the listener
+# has to be registered before core.database builds its client.
+current_scenario = contextvars.ContextVar("current_scenario", default=None)
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+SESSION_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "maxTimeMS"}
+
+
+class CommandRecorder(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        scenario = current_scenario.get()
+        if scenario is not None and event.command_name in EXPLAINABLE_COMMANDS:
+            self.commands.append((scenario, event.command_name, dict(event.command)))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+recorder = CommandRecorder()
+monitoring.register(recorder)
+
+from fastapi import HTTPException  # noqa: E402
+
+from core.database import DATABASE_NAME  # noqa: E402
+from core.security import load_principal  # noqa: E402
+from models.application import StatusEnum  # noqa: E402
+from models.candidate import RegionEnum, ExperienceLevelEnum, DesiredSalaryEnum  # noqa: E402
+from services.analytics import AnalyticsService  # noqa: E402
+from services.api_data import ApiService  # noqa: E402
+from services.candidate import CandidateService  # noqa: E402
+from services.employer import EmployerService  # noqa: E402
+
+DEFAULT_EXAMINED_RATIO = 10
+DEFAULT_EXAMINED_FLOOR = 100
+
+
+class Scenario(NamedTuple):
+    name: str
+    hot: bool
+    call: Callable
+
+
+def jobs_posted(**filters):
+    arguments = {"region": None, "city": None, "experience_level": None, "job_ad_title": None,
+                 "offered_salary": None, "q": None}
+    arguments.update(filters)
+    return CandidateService.get_jobs_posted(1, 10, **arguments)
+
+
+# Hot paths are the queries behind authentication and the candidate and employer endpoints, analytics and the
+# /data dumps are reported without failing the audit.
+SCENARIOS = [
+    Scenario("principal by email", True, lambda s: load_principal(s["candidate"]["email"])),
+    Scenario("candidate profile", True, lambda s: CandidateService.get_user_profile(s["candidate"])),
+    Scenario("job post by id", True, lambda s: CandidateService.get_job_post(str(s["job"]["_id"]))),
+    Scenario("jobs unfiltered", True, lambda s: jobs_posted()),
+    Scenario("jobs by region", True, lambda s: jobs_posted(region=RegionEnum(s["job"]["region"]))),
+    Scenario("jobs by region and experience", True, lambda s: jobs_posted(
+        region=RegionEnum(s["job"]["region"]), experience_level=ExperienceLevelEnum(s["job"]["experience_level"]))),
+    Scenario("jobs by city", True, lambda s: jobs_posted(city=s["job"]["city"].upper())),
+    Scenario("jobs by experience", True, lambda s: jobs_posted(
+        experience_level=ExperienceLevelEnum(s["job"]["experience_level"]))),
+    Scenario("jobs by salary", True, lambda s: jobs_posted(
+        offered_salary=DesiredSalaryEnum(s["job"]["offered_salary"]))),
+    Scenario("jobs by title", True, lambda s: jobs_posted(job_ad_title=s["job"]["job_ad_title"])),
+    Scenario("jobs by keywords", True, lambda s: jobs_posted(q=s["job"]["job_ad_title"])),
+    Scenario("jobs by city with facets", False, lambda s: jobs_posted(city=s["job"]["city"], facets=True)),
+    Scenario("candidate applications", True, lambda s: CandidateService.get_applications(1, 10, None, s["candidate"])),
+    Scenario("candidate applications by title", True, lambda s: CandidateService.get_applications(
+        1, 10, s["job"]["job_ad_title"], s["candidate"])),
+    Scenario("employer profile", True, lambda s: EmployerService.get_profile(s["employer"])),
+    Scenario("employer job posts", True, lambda s: EmployerService.get_job_posts(1, 10, None, s["employer"])),
+    Scenario("employer job posts by title", True, lambda s: EmployerService.get_job_posts(
+        1, 10, s["job"]["job_ad_title"].upper(), s["employer"])),
+    Scenario("employer job applications", True, lambda s: EmployerService.get_applications(
+        str(s["job"]["_id"]), StatusEnum.PENDING, s["employer"])),
+    Scenario("employer application detail", True, lambda s: EmployerService.get_user_application(
+        str(s["job"]["_id"]), str(s["application"]["_id"]), s["employer"])),
+    Scenario("analytics regions", False, lambda s: AnalyticsService.get_candidate_regional_distribution()),
+    Scenario("analytics overall", False, lambda s: AnalyticsService.get_overall_statistics()),
+    Scenario("analytics candidates", False, lambda s: AnalyticsService.get_candidate_overall_statistics()),
+    Scenario("analytics employers", False, lambda s: AnalyticsService.get_employers_overall_statistics()),
+    Scenario("analytics job posts", False, lambda s: AnalyticsService.get_job_posts_overall_statistics()),
+    Scenario("analytics applications", False, lambda s: AnalyticsService.get_applications_overall_statistics()),
+    Scenario("data job posts", False, lambda s: ApiService.get_all_job_posts()),
+    Scenario("data applications", False, lambda s: ApiService.get_applications()),
+]
+
+
+def load_samples(database):
+    """Pick a connected job, employer, candidate and application out of the seeded data."""
+    application = database.applications.find_one({})
+    if application is None:
+        return None
+    # Seeded applications reference their job as job_post_id, the ones created through the API as job_id
+    job = database.job_posts.find_one({"_id": application.get("job_id", application.get("job_post_id"))})
+    if job is None:
+        return None
+    return {
+        "application": application,
+        "job": job,
+        "candidate": database.users.find_one({"_id": application["candidate_id"]}, {"password": 0}),
+        "employer": database.users.find_one({"_id": job["employer_id"]}, {"password": 0}),
+    }
+
+
+async def run_scenarios(samples):
+    errors = {}
+    for scenario in SCENARIOS:
+        token = current_scenario.set(scenario.name)
+        try:
+            await scenario.call(samples)
+        except (HTTPException, ValueError, KeyError) as e:
+            # The commands issued before the failure are still audited
+            errors[scenario.name] = repr(e)
+        finally:
+            current_scenario.reset(token)
+    return errors
+
+
+# Explain
+def explain_command(database, command):
+    command = {
+        key: value for key, value in command.items()
+        if key not in SESSION_FIELDS and not key.startswith("$")
+    }
+    return database.command({"explain": command, "verbosity": "executionStats"})
+
+
+def walk_plan(node, summary):
+    """Sum the examined documents of the winning plans, rejected plans are skipped."""
+    if isinstance(node, list):
+        for item in node:
+            walk_plan(item, summary)
+        return
+    if not isinstance(node, dict):
+        return
+
+    for key, value in node.items():
+        if key in ("rejectedPlans", "allPlansExecution"):
+            continue
+        if key == "stage" and value == "COLLSCAN":
+            summary["collscan"] = True
+        elif key == "stage" and value in ("IXSCAN", "COUNT_SCAN"):
+            summary["indexes"].add(node.get("indexName"))
+        elif key == "collectionScans" and value:
+            # $lookup stages report the scans of the joined collection here
+            summary["collscan"] = True
+        elif key == "totalDocsExamined":
+            summary["docs_examined"] += value
+        elif key == "totalKeysExamined":
+            summary["keys_examined"] += value
+        elif key == "nCounted":
+            summary["returned"] = max(summary["returned"], value)
+        elif key == "indexesUsed":
+            summary["indexes"].update(value)
+        walk_plan(value, summary)
+
+
+def summarize_explain(explain):
+    summary = {"collscan": False, "docs_examined": 0, "keys_examined": 0, "returned": 0, "indexes": set()}
+    walk_plan(explain, summary)
+
+    if "stages" in explain:
+        # Classic aggregations report per stage, the last one holds what the pipeline returned
+        returned = explain["stages"][-1].get("nReturned", 0)
+    else:
+        returned = explain.get("executionStats", {}).get("nReturned", 0)
+    summary["returned"] = max(summary["returned"], returned)
+    summary["indexes"] = sorted(name for name in summary["indexes"] if name)
+    return summary
+
+
+def check_budget(summary, filtered, ratio, floor):
+    problems = []
+    if summary["collscan"] and filtered:
+        problems.append("collection scan")
+    budget = max(floor, ratio * summary["returned"])
+    if summary["docs_examined"] > budget:
+        problems.append(f"examined {summary['docs_examined']} docs for a budget of {budget}")
+    return problems
+
+
+def is_filtered(command_name, command):
+    if command_name == "aggregate":
+        first_stage = command.get("pipeline", [{}])[0] if command.get("pipeline") else {}
+        return bool(first_stage.get("$match"))
+    return bool(command.get("filter", command.get("query")))
+
+
+def audit_commands(database, ratio, floor):
+    hot = {scenario.name for scenario in SCENARIOS if scenario.hot}
+    results = []
+    for scenario, command_name, command in recorder.commands:
+        summary = summarize_explain(explain_command(database, command))
+        problems = check_budget(summary, is_filtered(command_name, command), ratio, floor)
+        results.append({
+            "scenario": scenario,
+            "hot": scenario in hot,
+            "command": command_name,
+            "collection": command[command_name],
+            "query": command.get("pipeline", command.get("filter", command.get("query", {}))),
+            **summary,
+            "problems": problems,
+        })
+    return results
+
+
+def print_report(results, errors):
+    for result in results:
+        status = "FAIL" if result["hot"] and result["problems"] else ("WARN" if result["problems"] else "ok")
+        print(
+            f"{status:4} {result['scenario']}: {result['command']} {result['collection']} "
+            f"returned {result['returned']}, examined {result['docs_examined']} docs / {result['keys_examined']} keys"
+            f"{', COLLSCAN' if result['collscan'] else ''}"
+            f"{', indexes ' + ','.join(result['indexes']) if result['indexes'] else ''}"
+        )
+        for problem in result["problems"]:
+            print(f"       {problem}")
+    for scenario, error in errors.items():
+        print(f"ERR  {scenario}: {error}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Explain every query the services issue against a seeded database and flag the hot-path "
+                    "queries that scan a collection or examine too many documents. The database is the one of the "
+                    "db_url setting, which the services connect to."
+    )
+    parser.add_argument("--max-examined-ratio", type=float, default=DEFAULT_EXAMINED_RATIO,
+                        help="Documents a query may examine per document it returns")
+    parser.add_argument("--min-examined-budget", type=int, default=DEFAULT_EXAMINED_FLOOR,
+                        help="Documents any query may examine regardless of what it returns")
+    parser.add_argument("--json", dest="json_file", help="Also write the full report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Explained on the server the services recorded them against
+    database = pymongo.MongoClient(settings.db_url)[DATABASE_NAME]
+
+    samples = load_samples(database)
+    if samples is None:
+        print("No connected application and job post found, seed the database first.")
+        sys.exit(2)
+
+    errors = asyncio.run(run_scenarios(samples))
+    results = audit_commands(database, args.max_examined_ratio, args.min_examined_budget)
+    print_report(results, errors)
+
+    if args.json_file:
+        with open(args.json_file, "w") as outfile:
+            outfile.write(json_util.dumps({"results": results, "errors": errors}, indent=4))
+
+    failures = [result for result in results if result["hot"] and result["problems"]]
+    if failures:
+        print(f"{len(failures)} hot-path queries over budget.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
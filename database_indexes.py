@@ -0,0 +1,71 @@
+import argparse
+import sys
+
+import pymongo
+
+from core.config import settings
+from core.database import DATABASE_NAME, INDEXES
+
+
+def index_key(spec):
+    if "weights" in spec:
+        # Text indexes are listed with an _fts/_ftsx key, the indexed fields are the keys of their weights
+        return ("text", tuple(sorted(spec["weights"])))
+    # The same fields under another collation serve other queries, live collations list every option with defaults
+    collation = spec.get("collation", {})
+    return (tuple((field, direction) for field, direction in spec["key"].items()),
+            collation.get("locale"), collation.get("strength"))
+
+
+def audit_collection(database, collection_name, declared):
+    """Compare the declared indexes with the live ones, by key pattern, along with their usage since restart."""
+    collection = database[collection_name]
+    live = {spec["name"]: spec for spec in collection.list_indexes()}
+    usage = {
+        stats["name"]: stats["accesses"]["ops"]
+        for stats in collection.aggregate([{"$indexStats": {}}])
+    }
+    live_keys = {index_key(spec): name for name, spec in live.items()}
+    declared_keys = {index_key(index.document) for index in declared}
+
+    missing = [index for index in declared if index_key(index.document) not in live_keys]
+    undeclared = [name for key, name in live_keys.items() if key not in declared_keys and name != "_id_"]
+    unused = [name for name in live if name != "_id_" and usage.get(name, 0) == 0]
+    return missing, undeclared, unused, usage
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report missing or unused indexes against the live database.")
+    parser.add_argument("--mongo-url", default=settings.db_url, help="MongoDB connection string")
+    parser.add_argument("--apply", action="store_true", help="Create the missing indexes")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    database = pymongo.MongoClient(args.mongo_url)[DATABASE_NAME]
+
+    problems = 0
+    for collection_name, declared in INDEXES.items():
+        missing, undeclared, unused, usage = audit_collection(database, collection_name, declared)
+        print(f"{collection_name}:")
+        for name, ops in sorted(usage.items()):
+            print(f"  {name}: {ops} operations since the last restart")
+        for index in missing:
+            print(f"  MISSING {index.document['name']} {dict(index.document['key'])}")
+        for name in undeclared:
+            print(f"  UNDECLARED {name}")
+        for name in unused:
+            print(f"  UNUSED {name}")
+        problems += len(missing)
+
+        if args.apply and missing:
+            database[collection_name].create_indexes(missing)
+            print(f"  created {len(missing)} missing indexes")
+
+    if problems and not args.apply:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
+import argparse
+import asyncio
+import hashlib
 import json
 import random
 import string
+import time
 import uuid
-from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+from typing import NamedTuple
 
+import motor.motor_asyncio
 import names
+import numpy as np
 import pymongo
+from bson import ObjectId
 from faker import Faker
+from pymongo.errors import BulkWriteError
 from tqdm import tqdm  # For progress tracking
 import logging  # For logging
 
@@ -22,16 +34,10 @@ logging.basicConfig(
     format='%(asctime)s %(levelname)s:%(message)s'
 )
 
-# Connect to MongoDB
-client = pymongo.MongoClient("mongodb://localhost:27018/")
-db = client["job_recruitment_system"]
-
-# Collections
-users_col = db["users"]
-candidate_profiles_col = db["candidate_profiles"]
-employer_profiles_col = db["employer_profiles"]
-job_posts_col = db["job_posts"]
-applications_col = db["applications"]
+# MongoDB connection, created lazily so every worker process opens its own client
+MONGO_URL = "mongodb://localhost:27018/"
+DATABASE_NAME = "job_recruitment_system"
+_client = None
 
 # Enumerations and Constants
 genders = ["Male", "Female"]
@@ -109,22 +115,101 @@ NUM_EMPLOYERS = 1000
 NUM_JOB_POSTS = 5000
 NUM_APPLICATIONS_PER_JOB = 100  # To reach over 500,000 applications
 BATCH_SIZE = 1000  # For bulk insert operations
+INFLIGHT_INSERTS = 4  # Concurrent unordered insert_many calls of the async loader
+QUEUE_SIZE = 8  # Batches buffered between the generators and the writers of the async loader
+PASSWORD_POOL_SIZE = 0  # Number of pre-hashed credentials shared by the generated users, 0 hashes every user
+PASSWORD_POOL_FILE = "password-pool.json"
+
+# Parameters for sharding. A shard is a fixed range of documents generated from its own seed, so the
+# output only depends on the seed and never on how many workers the shards are spread across.
+SHARD_SIZE = 5000
+JOB_POSTS_PER_APPLICATION_SHARD = 50
+DEFAULT_REFERENCE_TIME = datetime(2024, 11, 20, tzinfo=timezone.utc)
+
+# Tag byte embedded in the generated ObjectIds, one per collection
+COLLECTION_TAGS = {
+    "users": 1,
+    "candidate_profiles": 2,
+    "employer_profiles": 3,
+    "job_posts": 4,
+    "applications": 5,
+}
+
+# Reference "now" of the current shard, every generated timestamp and date is relative to it
+reference_time = DEFAULT_REFERENCE_TIME
+
+
+class SeedConfig(NamedTuple):
+    seed: int
+    mongo_url: str
+    reference_time: datetime
+    num_candidates: int
+    num_employers: int
+    num_job_posts: int
+    num_applications_per_job: int
+    password_pool: tuple = ()
+    generator: str = "faker"
+
+
+class SeedShard(NamedTuple):
+    collection: str
+    index: int
+    start: int
+    stop: int
+
+
+def get_database(mongo_url=MONGO_URL):
+    global _client
+    if _client is None:
+        _client = pymongo.MongoClient(mongo_url)
+    return _client[DATABASE_NAME]
+
+
+@lru_cache
+def object_id_prefix(seed, collection, timestamp):
+    return (
+        int(timestamp).to_bytes(4, "big")
+        + COLLECTION_TAGS[collection].to_bytes(1, "big")
+        + hashlib.sha256(str(seed).encode()).digest()[:3]
+    )
+
+
+def seeded_object_id(seed, collection, index):
+    """Build a reproducible ObjectId: reference timestamp | collection tag | seed digest | document index."""
+    return ObjectId(object_id_prefix(seed, collection, reference_time.timestamp()) + index.to_bytes(4, "big"))
+
+
+def begin_shard(config: SeedConfig, shard: SeedShard):
+    """Reset every random source used by the generators so the shard output only depends on its seed."""
+    global reference_time
+    reference_time = config.reference_time
+    shard_seed = f"{config.seed}:{shard.collection}:{shard.index}"
+    random.seed(shard_seed)
+    fake.seed_instance(shard_seed)
 
 
 # Helper Functions
-def generate_password(length=12):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+def generate_password(length=12, rng=random):
+    return ''.join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+
+def generate_uuid():
+    return uuid.UUID(int=random.getrandbits(128), version=4)
 
 
 def generate_timestamp():
-    return datetime.now(timezone.utc)
+    return reference_time
+
+
+def years_ago(years):
+    return (reference_time - timedelta(days=365 * years)).date()
 
 
 def generate_experience():
     experiences = []
     for _ in range(random.randint(1, 5)):
-        start_date = fake.date_between(start_date='-10y', end_date='-1y')
-        end_date = fake.date_between(start_date=start_date, end_date='today')
+        start_date = fake.date_between(start_date=years_ago(10), end_date=years_ago(1))
+        end_date = fake.date_between(start_date=start_date, end_date=reference_time.date())
         experiences.append({
             "title": fake.job(),
             "company": fake.company(),
@@ -138,8 +223,8 @@ def generate_experience():
 def generate_education():
     educations = []
     for _ in range(random.randint(1, 3)):
-        start_date = fake.date_between(start_date='-15y', end_date='-5y')
-        end_date = fake.date_between(start_date=start_date, end_date='today')
+        start_date = fake.date_between(start_date=years_ago(15), end_date=years_ago(5))
+        end_date = fake.date_between(start_date=start_date, end_date=reference_time.date())
         educations.append({
             "institution": fake.company(),
             "degree": random.choice(education_levels),
@@ -235,101 +320,39 @@ def generate_job_post(employer_id):
     }
 
 
-# Generate Users
-users = []
-candidate_user_ids = []
-employer_user_ids = []
-user_passwords = []
-employer_passwords = []
-
-print("Generating candidate users...")
-candidate_users = []
-for _ in tqdm(range(NUM_CANDIDATES)):
+# Document builders, one document per call, identified by its index in the collection
+def generate_user(config: SeedConfig, index, role):
     first_name = names.get_first_name()
     last_name = names.get_last_name()
+    if config.password_pool:
+        password, hashed_password = config.password_pool[index % len(config.password_pool)]
+    else:
+        password = generate_password()
+        hashed_password = hash_password(password)
     user = {
+        "_id": seeded_object_id(config.seed, "users", index),
         "first_name": first_name,
         "last_name": last_name,
         "gender": random.choice(genders),
-        "email": f"{first_name.lower()}.{last_name.lower()}.{uuid.uuid4()}@example.com",
-        "password": generate_password(),
-        "role": "candidate",
+        "email": f"{first_name.lower()}.{last_name.lower()}.{generate_uuid()}@example.com",
+        "password": hashed_password,
+        "role": role,
         "created_at": generate_timestamp()
     }
-    user_passwords.append({"email": user["email"], "password": user['password']})
-    user['password'] = hash_password(user['password'])
-    candidate_users.append(user)
-
-    # Bulk insert in batches
-    if len(candidate_users) >= BATCH_SIZE:
-        try:
-            result = users_col.insert_many(candidate_users)
-            candidate_user_ids.extend(result.inserted_ids)
-            candidate_users = []
-        except Exception as e:
-            logging.error(f"Error inserting candidate users: {e}")
+    return user, password
 
-# Insert any remaining candidate users
-if candidate_users:
-    try:
-        result = users_col.insert_many(candidate_users)
-        candidate_user_ids.extend(result.inserted_ids)
-    except Exception as e:
-        logging.error(f"Error inserting candidate users: {e}")
-
-print("Generating employer users...")
-employer_users = []
-for _ in tqdm(range(NUM_EMPLOYERS)):
-    first_name = names.get_first_name()
-    last_name = names.get_last_name()
-    user = {
-        "first_name": first_name,
-        "last_name": last_name,
-        "gender": random.choice(genders),
-        "email": f"{first_name.lower()}.{last_name.lower()}.{uuid.uuid4()}@example.com",
-        "password": generate_password(),
-        "role": "employer",
-        "created_at": generate_timestamp()
-    }
-    employer_passwords.append({"email": user["email"], "password": user['password']})
-    user['password'] = hash_password(user['password'])
-    employer_users.append(user)
-
-    # Bulk insert in batches
-    if len(employer_users) >= BATCH_SIZE:
-        try:
-            result = users_col.insert_many(employer_users)
-            employer_user_ids.extend(result.inserted_ids)
-            employer_users = []
-        except Exception as e:
-            logging.error(f"Error inserting employer users: {e}")
 
-# Insert any remaining employer users
-if employer_users:
-    try:
-        result = users_col.insert_many(employer_users)
-        employer_user_ids.extend(result.inserted_ids)
-    except Exception as e:
-        logging.error(f"Error inserting employer users: {e}")
-
-# Generate Candidate Profiles
-print("Generating candidate profiles...")
-candidate_profiles = []
-for candidate_id in tqdm(candidate_user_ids):
-    linkedin_url = f"https://www.linkedin.com/in/{uuid.uuid4()}/"
-    experiences = generate_experience()
-    educations = generate_education()
-    picture_url = fake.image_url()
-    cv_file = f"https://example.com/cv/{uuid.uuid4()}.pdf"
+def generate_candidate_profile(config: SeedConfig, index):
     skills, spoken_languages = generate_skills()
-    profile = {
-        "candidate_id": candidate_id,
+    return {
+        "_id": seeded_object_id(config.seed, "candidate_profiles", index),
+        "candidate_id": seeded_object_id(config.seed, "users", index),
         "profile_cv": {
-            "linkedin_url": linkedin_url,
-            "experience": experiences,
-            "education": educations,
-            "picture_url": picture_url,
-            "cv_file": cv_file
+            "linkedin_url": f"https://www.linkedin.com/in/{generate_uuid()}/",
+            "experience": generate_experience(),
+            "education": generate_education(),
+            "picture_url": fake.image_url(),
+            "cv_file": f"https://example.com/cv/{generate_uuid()}.pdf"
         },
         "job_criteria": {
             "seeked_jobs": generate_seeked_jobs(),
@@ -345,131 +368,667 @@ for candidate_id in tqdm(candidate_user_ids):
         },
         "created_at": generate_timestamp()
     }
-    candidate_profiles.append(profile)
 
-    # Bulk insert in batches
-    if len(candidate_profiles) >= BATCH_SIZE:
-        try:
-            candidate_profiles_col.insert_many(candidate_profiles)
-            candidate_profiles = []
-        except Exception as e:
-            logging.error(f"Error inserting candidate profiles: {e}")
 
-# Insert any remaining candidate profiles
-if candidate_profiles:
-    try:
-        candidate_profiles_col.insert_many(candidate_profiles)
-    except Exception as e:
-        logging.error(f"Error inserting candidate profiles: {e}")
-# Generate Employer Profiles
-print("Generating employer profiles...")
-employer_profiles = []
-for employer_id in tqdm(employer_user_ids):
-    company_name = fake.company()
-    address = fake.address()
-    zip_code = fake.postcode()
-    city = random.choice(cities)
-    country = "Rwanda"
-    company_industry = generate_company_industry()
-    company_description = fake.text(max_nb_chars=200)
-    position_in_organization = fake.job()
-    number_of_employees = random.randint(10, 1000)
-    profile = {
-        "employer_id": employer_id,
-        "company_name": company_name,
-        "address": address,
-        "zip_code": zip_code,
-        "city": city,
-        "country": country,
-        "company_industry": company_industry,
-        "company_description": company_description,
-        "position_in_organization": position_in_organization,
-        "number_of_employees": number_of_employees,
+def generate_employer_profile(config: SeedConfig, index):
+    return {
+        "_id": seeded_object_id(config.seed, "employer_profiles", index),
+        "employer_id": seeded_object_id(config.seed, "users", config.num_candidates + index),
+        "company_name": fake.company(),
+        "address": fake.address(),
+        "zip_code": fake.postcode(),
+        "city": random.choice(cities),
+        "country": "Rwanda",
+        "company_industry": generate_company_industry(),
+        "company_description": fake.text(max_nb_chars=200),
+        "position_in_organization": fake.job(),
+        "number_of_employees": random.randint(10, 1000),
         "created_at": generate_timestamp()
     }
-    employer_profiles.append(profile)
 
-    # Bulk insert in batches
-    if len(employer_profiles) >= BATCH_SIZE:
-        try:
-            employer_profiles_col.insert_many(employer_profiles)
-            employer_profiles = []
-        except Exception as e:
-            logging.error(f"Error inserting employer profiles: {e}")
 
-# Insert any remaining employer profiles
-if employer_profiles:
+def generate_applications(config: SeedConfig, job_index):
+    # Randomly select applicants for the job post
+    applicants = random.sample(range(config.num_candidates), config.num_applications_per_job)
+    job_post_id = seeded_object_id(config.seed, "job_posts", job_index)
+    first_index = job_index * config.num_applications_per_job
+    return [
+        {
+            "_id": seeded_object_id(config.seed, "applications", first_index + offset),
+            "candidate_id": seeded_object_id(config.seed, "users", candidate_index),
+            "job_post_id": job_post_id,
+            "application_date": generate_timestamp(),
+            "status": random.choice(application_statuses)
+        }
+        for offset, candidate_index in enumerate(applicants)
+    ]
+
+
+def generate_shard_documents(config: SeedConfig, shard: SeedShard):
+    """Yield the documents of a shard, along with the plaintext password of generated users."""
+    if config.generator == "vectorized":
+        yield from generate_vectorized_shard(config, shard)
+        return
+
+    for index in range(shard.start, shard.stop):
+        if shard.collection == "candidate_users":
+            yield generate_user(config, index, "candidate")
+        elif shard.collection == "employer_users":
+            yield generate_user(config, config.num_candidates + index, "employer")
+        elif shard.collection == "candidate_profiles":
+            yield generate_candidate_profile(config, index), None
+        elif shard.collection == "employer_profiles":
+            yield generate_employer_profile(config, index), None
+        elif shard.collection == "job_posts":
+            job_post = generate_job_post(seeded_object_id(
+                config.seed, "users", config.num_candidates + random.randrange(config.num_employers)))
+            job_post["_id"] = seeded_object_id(config.seed, "job_posts", index)
+            yield job_post, None
+        elif shard.collection == "applications":
+            for application in generate_applications(config, index):
+                yield application, None
+
+
+# Vectorized generation (--generator vectorized). Every column of a shard is drawn at once with NumPy, free
+# text comes from a small Faker pool per shard, and the documents are only assembled at the end.
+TEXT_POOL_SIZE = 256
+
+
+def vectorized_rng(config: SeedConfig, shard: SeedShard):
+    shard_digest = hashlib.sha256(f"{config.seed}:{shard.collection}:{shard.index}".encode()).digest()
+    return np.random.default_rng(int.from_bytes(shard_digest[:8], "big"))
+
+
+def draw(rng, options, size):
+    """Draw `size` values of `options` with replacement, as plain Python values."""
+    return np.asarray(options, dtype=object)[rng.integers(0, len(options), size)].tolist()
+
+
+def draw_samples(rng, options, size, low, high):
+    """Draw one sample without replacement of between `low` and `high` options per document."""
+    options = np.asarray(options, dtype=object)
+    counts = rng.integers(low, high + 1, size)
+    orders = rng.random((size, len(options))).argsort(axis=1)[:, :high]
+    return [options[order[:count]].tolist() for order, count in zip(orders, counts)]
+
+
+def split_rows(entries, counts):
+    """Split a flat list of entries into one list per document, `counts[i]` entries for document i."""
+    bounds = np.cumsum(counts).tolist()
+    return [entries[start:stop] for start, stop in zip([0] + bounds[:-1], bounds)]
+
+
+def draw_uuids(rng, size):
+    raw = rng.bytes(16 * size)
+    return [uuid.UUID(bytes=raw[offset:offset + 16], version=4) for offset in range(0, 16 * size, 16)]
+
+
+def draw_months(rng, low_days, high_days, size):
+    """Draw month/year strings between `high_days` and `low_days` days before the reference time."""
+    days = np.datetime64(reference_time.date()) - rng.integers(low_days, high_days + 1, size).astype("timedelta64[D]")
+    months = days.astype("datetime64[M]").astype(int)
+    month_names = np.asarray([datetime(2000, month, 1).strftime("%B") for month in range(1, 13)], dtype=object)
+    return [f"{name} {year}" for name, year in zip(month_names[months % 12], (months // 12 + 1970).tolist())]
+
+
+def draw_languages(rng, size):
+    counts = rng.integers(1, 4, size)
+    total = int(counts.sum())
+    entries = [
+        {"language": language, "fluency": fluency}
+        for language, fluency in zip(draw(rng, languages, total), draw(rng, fluency_levels, total))
+    ]
+    return split_rows(entries, counts)
+
+
+def draw_experiences(rng, size, pools):
+    counts = rng.integers(1, 6, size)
+    total = int(counts.sum())
+    ongoing = rng.random(total) < 0.5
+    entries = [
+        {
+            "title": title,
+            "company": company,
+            "start_date": start_date,
+            "end_date": None if is_ongoing else end_date,
+            "description": description
+        }
+        for title, company, start_date, end_date, is_ongoing, description in zip(
+            draw(rng, pools["jobs"], total), draw(rng, pools["companies"], total),
+            draw_months(rng, 365, 3650, total), draw_months(rng, 0, 365, total), ongoing.tolist(),
+            draw(rng, pools["text_200"], total))
+    ]
+    return split_rows(entries, counts)
+
+
+def draw_educations(rng, size, pools):
+    counts = rng.integers(1, 4, size)
+    total = int(counts.sum())
+    entries = [
+        {
+            "institution": institution,
+            "degree": degree,
+            "start_date": start_date,
+            "end_date": end_date,
+            "type_of_training": training
+        }
+        for institution, degree, start_date, end_date, training in zip(
+            draw(rng, pools["companies"], total), draw(rng, education_levels, total),
+            draw_months(rng, 1825, 5475, total), draw_months(rng, 0, 1825, total), draw(rng, pools["text_100"], total))
+    ]
+    return split_rows(entries, counts)
+
+
+def build_text_pools(collection):
+    """Faker values shared by the documents of a shard, Faker being seeded by `begin_shard`."""
+    if collection in ("candidate_users", "employer_users"):
+        return {
+            "first_names": [names.get_first_name() for _ in range(TEXT_POOL_SIZE)],
+            "last_names": [names.get_last_name() for _ in range(TEXT_POOL_SIZE)],
+        }
+    if collection == "applications":
+        return {}
+    return {
+        "jobs": [fake.job() for _ in range(TEXT_POOL_SIZE)],
+        "companies": [fake.company() for _ in range(TEXT_POOL_SIZE)],
+        "addresses": [fake.address() for _ in range(TEXT_POOL_SIZE)],
+        "postcodes": [fake.postcode() for _ in range(TEXT_POOL_SIZE)],
+        "image_urls": [fake.image_url() for _ in range(TEXT_POOL_SIZE)],
+        "text_100": [fake.text(max_nb_chars=100) for _ in range(TEXT_POOL_SIZE)],
+        "text_200": [fake.text(max_nb_chars=200) for _ in range(TEXT_POOL_SIZE)],
+        "text_300": [fake.text(max_nb_chars=300) for _ in range(TEXT_POOL_SIZE)],
+        "text_500": [fake.text(max_nb_chars=500) for _ in range(TEXT_POOL_SIZE)],
+    }
+
+
+def vectorized_users(config: SeedConfig, rng, indexes, role, pools):
+    size = len(indexes)
+    first_names = draw(rng, pools["first_names"], size)
+    last_names = draw(rng, pools["last_names"], size)
+    if config.password_pool:
+        credentials = [config.password_pool[index % len(config.password_pool)] for index in indexes]
+    else:
+        credentials = []
+        for _ in range(size):
+            password = generate_password()
+            credentials.append((password, hash_password(password)))
+
+    for index, first_name, last_name, gender, user_uuid, (password, hashed_password) in zip(
+            indexes, first_names, last_names, draw(rng, genders, size), draw_uuids(rng, size), credentials):
+        yield {
+            "_id": seeded_object_id(config.seed, "users", index),
+            "first_name": first_name,
+            "last_name": last_name,
+            "gender": gender,
+            "email": f"{first_name.lower()}.{last_name.lower()}.{user_uuid}@example.com",
+            "password": hashed_password,
+            "role": role,
+            "created_at": generate_timestamp()
+        }, password
+
+
+def vectorized_candidate_profiles(config: SeedConfig, rng, indexes, pools):
+    size = len(indexes)
+    columns = zip(
+        indexes, draw_uuids(rng, size), draw_experiences(rng, size, pools), draw_educations(rng, size, pools),
+        draw(rng, pools["image_urls"], size), draw_uuids(rng, size),
+        draw_samples(rng, seeked_jobs_options, size, 1, 4),
+        draw_samples(rng, business_sectors_options, size, 1, 5),
+        draw_samples(rng, geographical_mobility_options, size, 1, len(geographical_mobility_options)),
+        draw_samples(rng, desired_contract_types, size, 1, len(desired_contract_types)),
+        draw(rng, availability_options, size), draw(rng, desired_salary_options, size),
+        draw_samples(rng, key_skills_examples, size, 1, 5), draw_languages(rng, size),
+    )
+    for (index, linkedin_uuid, experiences, educations, picture_url, cv_uuid, seeked_jobs, business_sectors,
+         mobility, contract_types, availability, desired_salary, skills, spoken_languages) in columns:
+        yield {
+            "_id": seeded_object_id(config.seed, "candidate_profiles", index),
+            "candidate_id": seeded_object_id(config.seed, "users", index),
+            "profile_cv": {
+                "linkedin_url": f"https://www.linkedin.com/in/{linkedin_uuid}/",
+                "experience": experiences,
+                "education": educations,
+                "picture_url": picture_url,
+                "cv_file": f"https://example.com/cv/{cv_uuid}.pdf"
+            },
+            "job_criteria": {
+                "seeked_jobs": seeked_jobs,
+                "business_sectors": business_sectors,
+                "geographical_mobility": mobility,
+                "desired_contract_type": contract_types,
+                "availability": availability,
+                "desired_salary": desired_salary
+            },
+            "skills": {
+                "skill_description": skills,
+                "spoken_languages": spoken_languages
+            },
+            "created_at": generate_timestamp()
+        }, None
+
+
+def vectorized_employer_profiles(config: SeedConfig, rng, indexes, pools):
+    size = len(indexes)
+    columns = zip(
+        indexes, draw(rng, pools["companies"], size), draw(rng, pools["addresses"], size),
+        draw(rng, pools["postcodes"], size), draw(rng, cities, size),
+        draw_samples(rng, business_sectors_options, size, 1, 5), draw(rng, pools["text_200"], size),
+        draw(rng, pools["jobs"], size), rng.integers(10, 1001, size).tolist(),
+    )
+    for (index, company_name, address, zip_code, city, company_industry, company_description,
+         position_in_organization, number_of_employees) in columns:
+        yield {
+            "_id": seeded_object_id(config.seed, "employer_profiles", index),
+            "employer_id": seeded_object_id(config.seed, "users", config.num_candidates + index),
+            "company_name": company_name,
+            "address": address,
+            "zip_code": zip_code,
+            "city": city,
+            "country": "Rwanda",
+            "company_industry": company_industry,
+            "company_description": company_description,
+            "position_in_organization": position_in_organization,
+            "number_of_employees": number_of_employees,
+            "created_at": generate_timestamp()
+        }, None
+
+
+def vectorized_job_posts(config: SeedConfig, rng, indexes, pools):
+    size = len(indexes)
+    columns = zip(
+        indexes, rng.integers(0, config.num_employers, size).tolist(), draw(rng, pools["jobs"], size),
+        draw(rng, number_of_positions_options, size), draw(rng, pools["text_500"], size),
+        draw(rng, pools["text_300"], size), draw(rng, business_sectors_options, size),
+        draw(rng, seeked_jobs_options, size), draw(rng, experience_levels, size), draw_languages(rng, size),
+        draw(rng, education_levels, size), draw(rng, job_types, size), draw(rng, regions, size),
+        draw(rng, cities, size), draw(rng, remote_work_options, size), draw(rng, team_management_options, size),
+        draw_samples(rng, key_skills_examples, size, 1, 5), draw(rng, desired_salary_options, size),
+    )
+    for (index, employer_index, job_ad_title, number_of_positions, job_description, required_profile_description,
+         sector, job_category, experience_level, languages_required, education_level_required, job_type, region,
+         city, remote_work, team_management, key_skills, offered_salary) in columns:
+        yield {
+            "_id": seeded_object_id(config.seed, "job_posts", index),
+            "employer_id": seeded_object_id(config.seed, "users", config.num_candidates + employer_index),
+            "job_ad_title": job_ad_title,
+            "number_of_positions": number_of_positions,
+            "job_description": job_description,
+            "required_profile_description": required_profile_description,
+            "sector": sector,
+            "job_category": job_category,
+            "experience_level": experience_level,
+            "languages_required": languages_required,
+            "education_level_required": education_level_required,
+            "job_type": job_type,
+            "region": region,
+            "city": city,
+            "remote_work": remote_work,
+            "team_management": team_management,
+            "key_skills": key_skills,
+            "offered_salary": offered_salary,
+            "created_at": generate_timestamp()
+        }, None
+
+
+def vectorized_applications(config: SeedConfig, rng, job_indexes):
+    """Assign applicants to every job of the shard at once.
+
+    Each job gets the arithmetic progression start + step * k (mod number of candidates) with a random start
+    and a random step coprime with the number of candidates, which yields distinct applicants per job.
+    """
+    jobs = len(job_indexes)
+    per_job = config.num_applications_per_job
+    steps = np.arange(1, max(config.num_candidates, 2))
+    steps = steps[np.gcd(steps, config.num_candidates) == 1]
+    starts = rng.integers(0, config.num_candidates, (jobs, 1))
+    strides = steps[rng.integers(0, len(steps), (jobs, 1))]
+    applicants = ((starts + strides * np.arange(per_job)) % config.num_candidates).ravel().tolist()
+    job_of_application = np.repeat(np.asarray(job_indexes), per_job).tolist()
+    statuses = draw(rng, application_statuses, jobs * per_job)
+
+    first_index = job_indexes[0] * per_job
+    job_post_ids = {index: seeded_object_id(config.seed, "job_posts", index) for index in job_indexes}
+    for offset, (job_index, candidate_index, status) in enumerate(zip(job_of_application, applicants, statuses)):
+        yield {
+            "_id": seeded_object_id(config.seed, "applications", first_index + offset),
+            "candidate_id": seeded_object_id(config.seed, "users", candidate_index),
+            "job_post_id": job_post_ids[job_index],
+            "application_date": generate_timestamp(),
+            "status": status
+        }, None
+
+
+def generate_vectorized_shard(config: SeedConfig, shard: SeedShard):
+    rng = vectorized_rng(config, shard)
+    pools = build_text_pools(shard.collection)
+    indexes = list(range(shard.start, shard.stop))
+    if not indexes:
+        return iter(())
+    if shard.collection == "candidate_users":
+        return vectorized_users(config, rng, indexes, "candidate", pools)
+    if shard.collection == "employer_users":
+        return vectorized_users(config, rng, [config.num_candidates + index for index in indexes], "employer", pools)
+    if shard.collection == "candidate_profiles":
+        return vectorized_candidate_profiles(config, rng, indexes, pools)
+    if shard.collection == "employer_profiles":
+        return vectorized_employer_profiles(config, rng, indexes, pools)
+    if shard.collection == "job_posts":
+        return vectorized_job_posts(config, rng, indexes, pools)
+    return vectorized_applications(config, rng, indexes)
+
+
+# Shard collections map to the MongoDB collection they are written to
+SHARD_TARGETS = {
+    "candidate_users": "users",
+    "employer_users": "users",
+    "candidate_profiles": "candidate_profiles",
+    "employer_profiles": "employer_profiles",
+    "job_posts": "job_posts",
+    "applications": "applications",
+}
+
+
+def seed_shard(config: SeedConfig, shard: SeedShard):
+    """Generate and insert one shard, returns the number of documents and the generated credentials."""
+    begin_shard(config, shard)
+    collection = get_database(config.mongo_url)[SHARD_TARGETS[shard.collection]]
+
+    inserted = 0
+    credentials = []
+    batch = []
+    for document, password in generate_shard_documents(config, shard):
+        if password is not None:
+            credentials.append({"email": document["email"], "password": password})
+        batch.append(document)
+
+        # Bulk insert in batches
+        if len(batch) >= BATCH_SIZE:
+            inserted += insert_batch(collection, batch, shard)
+            batch = []
+
+    # Insert any remaining documents
+    if batch:
+        inserted += insert_batch(collection, batch, shard)
+
+    return inserted, credentials
+
+
+def generate_shard(config: SeedConfig, shard: SeedShard):
+    """Generate one shard without inserting it, the async loader does the writes itself."""
+    begin_shard(config, shard)
+    documents = []
+    credentials = []
+    for document, password in generate_shard_documents(config, shard):
+        if password is not None:
+            credentials.append({"email": document["email"], "password": password})
+        documents.append(document)
+    return documents, credentials
+
+
+def insert_batch(collection, batch, shard: SeedShard):
     try:
-        employer_profiles_col.insert_many(employer_profiles)
+        return len(collection.insert_many(batch).inserted_ids)
     except Exception as e:
-        logging.error(f"Error inserting employer profiles: {e}")
-
-# Generate Job Posts
-job_post_ids = []
-print("Generating job posts...")
-job_posts = []
-for _ in tqdm(range(NUM_JOB_POSTS)):
-    employer_id = random.choice(employer_user_ids)
-    job_post = generate_job_post(employer_id)
-    job_posts.append(job_post)
-
-    # Bulk insert in batches
-    if len(job_posts) >= BATCH_SIZE:
+        logging.error(f"Error inserting {shard.collection} (shard {shard.index}): {e}")
+        return 0
+
+
+def build_shards(collection, total, shard_size):
+    return [
+        SeedShard(collection, index, start, min(start + shard_size, total))
+        for index, start in enumerate(range(0, total, shard_size))
+    ]
+
+
+def plan_shards(config: SeedConfig):
+    return [
+        build_shards("candidate_users", config.num_candidates, SHARD_SIZE),
+        build_shards("employer_users", config.num_employers, SHARD_SIZE),
+        build_shards("candidate_profiles", config.num_candidates, SHARD_SIZE),
+        build_shards("employer_profiles", config.num_employers, SHARD_SIZE),
+        build_shards("job_posts", config.num_job_posts, SHARD_SIZE),
+        build_shards("applications", config.num_job_posts, JOB_POSTS_PER_APPLICATION_SHARD),
+    ]
+
+
+def run_shards(config: SeedConfig, shards, executor):
+    """Run the shards of one collection, in the calling process or across the pool, in shard order."""
+    if executor is None:
+        results = (seed_shard(config, shard) for shard in shards)
+    else:
+        results = executor.map(seed_shard, [config] * len(shards), shards)
+
+    inserted = 0
+    credentials = []
+    for shard_inserted, shard_credentials in tqdm(results, total=len(shards), unit="shard"):
+        inserted += shard_inserted
+        credentials.extend(shard_credentials)
+    return inserted, credentials
+
+
+def build_password_pool(seed, size, executor):
+    """Hash `size` passwords derived from the seed, across the pool when there is one."""
+    rng = random.Random(f"{seed}:password_pool")
+    passwords = [generate_password(rng=rng) for _ in range(size)]
+    if executor is None:
+        hashes = map(hash_password, passwords)
+    else:
+        hashes = executor.map(hash_password, passwords, chunksize=max(1, size // 64))
+    return tuple(zip(passwords, hashes))
+
+
+def load_password_pool(seed, size, executor, fixture_path):
+    """Reuse the pool from the fixture file when it matches the seed and size, otherwise build and save it."""
+    try:
+        with open(fixture_path) as fixture:
+            fixture_data = json.load(fixture)
+        if fixture_data["seed"] == seed and len(fixture_data["passwords"]) == size:
+            return tuple((entry["password"], entry["hash"]) for entry in fixture_data["passwords"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    print(f"Hashing a pool of {size} passwords...")
+    password_pool = build_password_pool(seed, size, executor)
+    with open(fixture_path, 'w') as outfile:
+        json.dump({
+            "seed": seed,
+            "passwords": [{"password": password, "hash": hashed} for password, hashed in password_pool]
+        }, outfile, indent=4)
+    return password_pool
+
+
+def seed_database(config: SeedConfig, workers=1, password_pool_size=PASSWORD_POOL_SIZE,
+                  password_pool_file=PASSWORD_POOL_FILE):
+    passwords = {"candidate_users": [], "employer_users": []}
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if password_pool_size > 0:
+            password_pool = load_password_pool(config.seed, password_pool_size, executor, password_pool_file)
+            config = config._replace(password_pool=password_pool)
+
+        for shards in plan_shards(config):
+            if not shards:
+                continue
+            collection = shards[0].collection
+            print(f"Generating {collection.replace('_', ' ')}...")
+            inserted, credentials = run_shards(config, shards, executor)
+            logging.info(f"Inserted {inserted} {collection} from {len(shards)} shards")
+            if collection in passwords:
+                passwords[collection] = credentials
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return passwords
+
+
+async def produce_batches(config: SeedConfig, shards, executor, window, queue: asyncio.Queue, credentials):
+    """Generate shards on the executor, at most `window` at a time, and queue their batches in shard order.
+
+    The queue is bounded, so when the writers fall behind `queue.put` blocks and no new shard is submitted.
+    """
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    for shard in shards:
+        pending.append(loop.run_in_executor(executor, generate_shard, config, shard))
+        if len(pending) >= window:
+            await queue_shard(await pending.popleft(), queue, credentials)
+    while pending:
+        await queue_shard(await pending.popleft(), queue, credentials)
+
+
+async def queue_shard(generated, queue: asyncio.Queue, credentials):
+    documents, shard_credentials = generated
+    credentials.extend(shard_credentials)
+    for start in range(0, len(documents), BATCH_SIZE):
+        await queue.put(documents[start:start + BATCH_SIZE])
+
+
+async def write_batches(collection, queue: asyncio.Queue, progress):
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            return
         try:
-            result = job_posts_col.insert_many(job_posts)
-            job_post_ids.extend(result.inserted_ids)
-            job_posts = []
+            result = await collection.insert_many(batch, ordered=False)
+            progress.update(len(result.inserted_ids))
+        except BulkWriteError as e:
+            logging.error(f"Error inserting into {collection.name}: {e.details.get('writeErrors', [])[:1]}")
+            progress.update(e.details.get("nInserted", 0))
         except Exception as e:
-            logging.error(f"Error inserting job posts: {e}")
+            logging.error(f"Error inserting into {collection.name}: {e}")
 
-# Insert any remaining job posts
-if job_posts:
-    try:
-        result = job_posts_col.insert_many(job_posts)
-        job_post_ids.extend(result.inserted_ids)
-    except Exception as e:
-        logging.error(f"Error inserting job posts: {e}")
-
-# Generate Applications
-print("Generating applications...")
-applications = []
-total_applications = NUM_JOB_POSTS * NUM_APPLICATIONS_PER_JOB
-with tqdm(total=total_applications) as pbar:
-    for job_post_id in job_post_ids:
-        # Randomly select applicants for each job post
-        applicants = random.sample(candidate_user_ids, NUM_APPLICATIONS_PER_JOB)
-        for candidate_id in applicants:
-            application = {
-                "candidate_id": candidate_id,
-                "job_post_id": job_post_id,
-                "application_date": generate_timestamp(),
-                "status": random.choice(application_statuses)
-            }
-            applications.append(application)
-            pbar.update(1)
-
-            # Bulk insert in batches
-            if len(applications) >= BATCH_SIZE:
-                try:
-                    applications_col.insert_many(applications)
-                    applications = []
-                except Exception as e:
-                    logging.error(f"Error inserting applications: {e}")
-
-# Insert any remaining applications
-if applications:
+
+async def load_shards(config: SeedConfig, database, shards, executor, window, inflight, queue_size):
+    """Stream the shards of one collection through a bounded queue into `inflight` concurrent writers."""
+    collection = database[SHARD_TARGETS[shards[0].collection]]
+    total = sum(shard.stop - shard.start for shard in shards)
+    if shards[0].collection == "applications":
+        total *= config.num_applications_per_job
+
+    queue = asyncio.Queue(maxsize=queue_size)
+    credentials = []
+    started = time.perf_counter()
+    with tqdm(total=total, unit="doc") as progress:
+        writers = [asyncio.create_task(write_batches(collection, queue, progress)) for _ in range(inflight)]
+        try:
+            await produce_batches(config, shards, executor, window, queue, credentials)
+            for _ in writers:
+                await queue.put(None)
+            await asyncio.gather(*writers)
+        finally:
+            for writer in writers:
+                writer.cancel()
+        inserted = progress.n
+
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed else 0.0
+    print(f"Inserted {inserted} {shards[0].collection.replace('_', ' ')} in {elapsed:.1f}s ({rate:,.0f} docs/s)")
+    logging.info(f"Inserted {inserted} {shards[0].collection} in {elapsed:.1f}s ({rate:.0f} docs/s)")
+    return credentials
+
+
+async def seed_database_async(config: SeedConfig, workers=1, password_pool_size=PASSWORD_POOL_SIZE,
+                              password_pool_file=PASSWORD_POOL_FILE, inflight=INFLIGHT_INSERTS,
+                              queue_size=QUEUE_SIZE):
+    """Overlap generation with writes: shards are generated on a pool while Motor inserts earlier batches.
+
+    With a single worker, generation runs on one background thread since the generators share the global
+    random state of the process.
+    """
+    passwords = {"candidate_users": [], "employer_users": []}
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+    client = motor.motor_asyncio.AsyncIOMotorClient(config.mongo_url)
     try:
-        applications_col.insert_many(applications)
-    except Exception as e:
-        logging.error(f"Error inserting applications: {e}")
+        if password_pool_size > 0:
+            password_pool = await asyncio.get_running_loop().run_in_executor(
+                None, load_password_pool, config.seed, password_pool_size, executor, password_pool_file)
+            config = config._replace(password_pool=password_pool)
 
-data = {
-    "user_passwords": user_passwords,
-    "employer_passwords": employer_passwords
-}
+        database = client[DATABASE_NAME]
+        for shards in plan_shards(config):
+            if not shards:
+                continue
+            collection = shards[0].collection
+            print(f"Generating {collection.replace('_', ' ')}...")
+            credentials = await load_shards(config, database, shards, executor, window=workers * 2,
+                                            inflight=inflight, queue_size=queue_size)
+            if collection in passwords:
+                passwords[collection] = credentials
+    finally:
+        client.close()
+        executor.shutdown()
+    return passwords
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the job recruitment database with synthetic data.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes generating shards")
+    parser.add_argument("--generator", choices=["faker", "vectorized"], default="faker",
+                        help="'vectorized' draws whole columns per shard with NumPy, for very large datasets")
+    parser.add_argument("--loader", choices=["sync", "async"], default="sync",
+                        help="'async' streams generated batches into concurrent unordered Motor inserts")
+    parser.add_argument("--inflight", type=int, default=INFLIGHT_INSERTS,
+                        help="Concurrent insert_many calls of the async loader")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE,
+                        help="Batches buffered between generation and writes in the async loader")
+    parser.add_argument("--seed", type=int, default=None, help="Seed making the generated dataset reproducible")
+    parser.add_argument("--mongo-url", default=MONGO_URL, help="MongoDB connection string")
+    parser.add_argument("--reference-time", type=datetime.fromisoformat,
+                        default=DEFAULT_REFERENCE_TIME, help="ISO timestamp used as 'now' by the generators")
+    parser.add_argument("--candidates", type=int, default=NUM_CANDIDATES)
+    parser.add_argument("--employers", type=int, default=NUM_EMPLOYERS)
+    parser.add_argument("--job-posts", type=int, default=NUM_JOB_POSTS)
+    parser.add_argument("--applications-per-job", type=int, default=NUM_APPLICATIONS_PER_JOB)
+    parser.add_argument("--password-pool", type=int, default=PASSWORD_POOL_SIZE,
+                        help="Hash this many passwords once and share them across the generated users")
+    parser.add_argument("--password-pool-file", default=PASSWORD_POOL_FILE,
+                        help="Fixture file holding the plaintext/hash pairs of the password pool")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    moment = args.reference_time
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    config = SeedConfig(
+        seed=seed,
+        mongo_url=args.mongo_url,
+        reference_time=moment,
+        num_candidates=args.candidates,
+        num_employers=args.employers,
+        num_job_posts=args.job_posts,
+        num_applications_per_job=min(args.applications_per_job, args.candidates),
+        generator=args.generator,
+    )
+    print(f"Seeding with seed {seed} across {args.workers} worker(s)...")
+    logging.info(f"Seeding with {config}")
+
+    if args.loader == "async":
+        passwords = asyncio.run(seed_database_async(
+            config, workers=args.workers, password_pool_size=args.password_pool,
+            password_pool_file=args.password_pool_file, inflight=args.inflight, queue_size=args.queue_size))
+    else:
+        passwords = seed_database(config, workers=args.workers, password_pool_size=args.password_pool,
+                                  password_pool_file=args.password_pool_file)
+
+    data = {
+        "seed": seed,
+        "user_passwords": passwords["candidate_users"],
+        "employer_passwords": passwords["employer_users"]
+    }
+
+    # Save to JSON file
+    with open("usernames-passwords.json", 'w') as outfile:
+        json.dump(data, outfile, indent=4)
+
+    print("Data generation completed successfully.")
 
-# Save to JSON file
-with open("usernames-passwords.json", 'w') as outfile:
-    json.dump(data, outfile, indent=4)
 
-print("Data generation completed successfully.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import argparse
+import gzip
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import bson
+import pymongo
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo.errors import BulkWriteError
+from tqdm import tqdm
+
+# Configure logging
+logging.basicConfig(
+    filename='data_generation.log',
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s:%(message)s'
+)
+
+MONGO_URL = "mongodb://localhost:27018/"
+DATABASE_NAME = "job_recruitment_system"
+COLLECTIONS = ["users", "candidate_profiles", "employer_profiles", "job_posts", "applications"]
+MANIFEST_FILE = "manifest.json"
+BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 5000
+RAW_BSON = CodecOptions(document_class=RawBSONDocument)
+
+
+def snapshot_file(directory: Path, collection, snapshot_format):
+    return directory / f"{collection}.{snapshot_format}.gz"
+
+
+# Export
+def export_collection(database, collection, directory: Path, snapshot_format):
+    """Stream a collection in _id order into a gzip file, raw BSON documents are written without decoding."""
+    source = database.get_collection(collection, codec_options=RAW_BSON)
+    cursor = source.find({}, sort=[("_id", 1)], batch_size=EXPORT_BATCH_SIZE)
+
+    count = 0
+    with gzip.open(snapshot_file(directory, collection, snapshot_format), "wb") as outfile:
+        for document in tqdm(cursor, total=source.estimated_document_count(), unit="doc"):
+            if snapshot_format == "bson":
+                outfile.write(document.raw)
+            else:
+                line = json_util.dumps(bson.decode(document.raw), json_options=json_util.CANONICAL_JSON_OPTIONS)
+                outfile.write(line.encode() + b"\n")
+            count += 1
+    return count
+
+
+def export_indexes(database, collection):
+    """Index specs as returned by listIndexes, minus the _id index which every collection gets for free."""
+    return [
+        {key: value for key, value in spec.items() if key not in ("v", "ns")}
+        for spec in database[collection].list_indexes()
+        if spec["name"] != "_id_"
+    ]
+
+
+def export_snapshot(mongo_url, directory: Path, snapshot_format):
+    directory.mkdir(parents=True, exist_ok=True)
+    database = pymongo.MongoClient(mongo_url)[DATABASE_NAME]
+
+    manifest = {"format": snapshot_format, "collections": {}}
+    for collection in COLLECTIONS:
+        print(f"Exporting {collection}...")
+        count = export_collection(database, collection, directory, snapshot_format)
+        manifest["collections"][collection] = {"count": count, "indexes": export_indexes(database, collection)}
+        logging.info(f"Exported {count} {collection} to {directory}")
+
+    with open(directory / MANIFEST_FILE, "w") as outfile:
+        outfile.write(json_util.dumps(manifest, indent=4, json_options=json_util.CANONICAL_JSON_OPTIONS))
+
+
+# Restore
+def read_snapshot(path: Path, snapshot_format):
+    with gzip.open(path, "rb") as infile:
+        if snapshot_format == "bson":
+            yield from bson.decode_file_iter(infile, codec_options=RAW_BSON)
+        else:
+            for line in infile:
+                yield json_util.loads(line)
+
+
+def read_batches(documents):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_batch(collection, batch):
+    try:
+        return len(collection.insert_many(batch, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        logging.error(f"Error restoring {collection.name}: {e.details.get('writeErrors', [])[:1]}")
+        return e.details.get("nInserted", 0)
+
+
+def restore_collection(collection, documents, executor, window, total):
+    """Insert the batches on the executor with at most `window` of them in flight, in unordered mode."""
+    inserted = 0
+    pending = deque()
+    with tqdm(total=total, unit="doc") as progress:
+        for batch in read_batches(documents):
+            pending.append(executor.submit(insert_batch, collection, batch))
+            if len(pending) >= window:
+                inserted += pending.popleft().result()
+                progress.update(inserted - progress.n)
+        while pending:
+            inserted += pending.popleft().result()
+            progress.update(inserted - progress.n)
+    return inserted
+
+
+def restore_snapshot(mongo_url, directory: Path, workers, drop):
+    with open(directory / MANIFEST_FILE) as infile:
+        manifest = json_util.loads(infile.read())
+    snapshot_format = manifest["format"]
+    database = pymongo.MongoClient(mongo_url, maxPoolSize=max(workers, 1) + 1)[DATABASE_NAME]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for collection, details in manifest["collections"].items():
+            target = database.get_collection(collection, codec_options=RAW_BSON)
+            if drop:
+                target.drop()
+
+            print(f"Restoring {collection}...")
+            started = time.perf_counter()
+            documents = read_snapshot(snapshot_file(directory, collection, snapshot_format), snapshot_format)
+            inserted = restore_collection(target, documents, executor, window=workers * 2, total=details["count"])
+            elapsed = time.perf_counter() - started
+            print(f"Restored {inserted} {collection} in {elapsed:.1f}s")
+            logging.info(f"Restored {inserted} {collection} from {directory} in {elapsed:.1f}s")
+
+    # Indexes are built once the data is in, which is much cheaper than maintaining them during the inserts
+    for collection, details in manifest["collections"].items():
+        if details["indexes"]:
+            print(f"Building {len(details['indexes'])} indexes on {collection}...")
+            database.command("createIndexes", collection, indexes=details["indexes"])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export or restore a snapshot of the job recruitment database.")
+    parser.add_argument("command", choices=["export", "restore"])
+    parser.add_argument("directory", type=Path, help="Directory holding one snapshot file per collection")
+    parser.add_argument("--mongo-url", default=MONGO_URL, help="MongoDB connection string")
+    parser.add_argument("--format", choices=["bson", "jsonl"], default="bson", help="Snapshot file format (export)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent insert_many calls (restore)")
+    parser.add_argument("--drop", action="store_true", help="Drop the collections before restoring them")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == "export":
+        export_snapshot(args.mongo_url, args.directory, args.format)
+        print(f"Snapshot exported to {args.directory}.")
+    else:
+        restore_snapshot(args.mongo_url, args.directory, max(args.workers, 1), args.drop)
+        print(f"Snapshot restored from {args.directory}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,31 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+from core.config import settings
+from core.database import ensure_indexes, warm_up_pool, close_client, job_posts
+from core.monitoring import database_timing_middleware
+from services.job_catalog import keep_job_catalog_in_sync
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_pool()
+    if settings.db_ensure_indexes:
+        await ensure_indexes()
+    # Loaded in the background, /candidate/jobs queries MongoDB until the catalog is ready
+    catalog_sync = None
+    if settings.job_catalog_enabled:
+        catalog_sync = asyncio.create_task(keep_job_catalog_in_sync(job_posts, settings.job_catalog_sync_seconds))
+    yield
+    if catalog_sync is not None:
+        catalog_sync.cancel()
+    close_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -18,6 +42,7 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
 )
+app.middleware("http")(database_timing_middleware)
 
 # Define your routers here
 from routers.auth import router as auth_router
@@ -25,9 +50,11 @@ from routers.candidate import router as candidates_router
 from routers.employers import router as employers_router
 from routers.analytics import router as analytics_router
 from routers.data import router as data_router
+from routers.metrics import router as metrics_router
 
 app.include_router(auth_router)
 app.include_router(candidates_router)
 app.include_router(employers_router)
 app.include_router(analytics_router)
 app.include_router(data_router)
+app.include_router(metrics_router)
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class ExportCollectionEnum(str, Enum):
+    JOB_POSTS = "job_posts"
+    EMPLOYER_PROFILES = "employer_profiles"
+    CANDIDATE_PROFILES = "candidate_profiles"
+    APPLICATIONS = "applications"
+    USERS = "users"
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CountModeEnum(str, Enum):
+    AUTO = "auto"  # Estimated when unfiltered, cached for a few seconds when filtered
+    EXACT = "exact"
+    NONE = "none"
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
 from services.analytics import AnalyticsService
+from utils.response import BSONRoute
 
-router = APIRouter(tags=["Analytics"], prefix="/analytics")
+router = APIRouter(tags=["Analytics"], prefix="/analytics", route_class=BSONRoute)
 
 
 @router.get('/')
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, UploadFile
 from fastapi.security import OAuth2PasswordRequestForm
 
+from core.security import check_employer_role
 from models.employer import CreateEmployer
 from models.user import UserCreate, RoleEnum
 from services.auth import AuthService
+from utils.response import BSONRoute
 
-router = APIRouter(tags=["Auth"], prefix="/auth")
+router = APIRouter(tags=["Auth"], prefix="/auth", route_class=BSONRoute)
 
 
 @router.post('/register/candidate')
@@ -13,6 +15,19 @@ async def register_candidate(user: UserCreate):
     return await AuthService.register_user(user, user_type=RoleEnum.CANDIDATE)
 
 
+@router.post('/register/candidates/bulk')
+async def bulk_register_candidates(file: UploadFile, current_user=Depends(check_employer_role)):
+    """
+       Register candidates in bulk from a CSV (with a header row) or JSONL upload, for the employers importing
+       the candidates of a partner or a job fair.
+
+       Every row needs first_name, last_name, email, gender and password. The response reports,
+       per row, whether the candidate was created, was a duplicate or was invalid. An upload that stops being
+       valid UTF-8 is imported up to that row, which is reported as invalid.
+       """
+    return await AuthService.bulk_register_candidates(file)
+
+
 @router.post('/register/employer')
 async def register_employer(user: UserCreate, employer_profile: CreateEmployer):
     return await AuthService.register_employer(user, employer_profile)
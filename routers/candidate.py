@@ -2,17 +2,22 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, UploadFile, Query
 
-from core.security import get_current_user, check_candidate_role
+from core.security import get_current_user, get_current_user_document, check_candidate_role
 from models.candidate import CandidateBasicInfo, JobCriteria, Skills, RegionEnum, ExperienceLevelEnum, \
-    DesiredSalaryEnum
+    DesiredSalaryEnum, ContractTypeEnum, EducationLevelEnum
+from models.employer import IndustryEnum
+from models.job_post import RemoteWorkEnum
+from models.pagination import CountModeEnum
 from services.candidate import CandidateService
+from utils.response import BSONRoute
 
-router = APIRouter(tags=["Candidates"], prefix="/candidate", dependencies=[Depends(check_candidate_role)])
+router = APIRouter(tags=["Candidates"], prefix="/candidate", dependencies=[Depends(check_candidate_role)],
+                   route_class=BSONRoute)
 
 
 # Create and update the user profile
 @router.get("/profile")
-async def get_candidate_profile(current_user=Depends(get_current_user)):
+async def get_candidate_profile(current_user=Depends(get_current_user_document)):
     return await CandidateService.get_user_profile(current_user)
 
 
@@ -46,6 +51,16 @@ async def get_jobs(
         experience_level: Optional[ExperienceLevelEnum] = Query(None, description="Filter jobs per experience level"),
         job_ad_title: Optional[str] = Query(None, description="Filter jobs per ad title"),
         offered_salary: Optional[DesiredSalaryEnum] = Query(None, description="Filter jobs per offered salary"),
+        job_type: Optional[ContractTypeEnum] = Query(None, description="Filter jobs per contract type"),
+        remote_work: Optional[RemoteWorkEnum] = Query(None, description="Filter jobs per remote work option"),
+        sector: Optional[IndustryEnum] = Query(None, description="Filter jobs per business sector"),
+        education_level_required: Optional[EducationLevelEnum] = Query(
+            None, description="Filter jobs per required education level"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_jobs"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
+        q: Optional[str] = Query(None, description="Keywords searched in the title, key skills and descriptions"),
+        facets: bool = Query(False, description="Also return the job counts per region, salary, experience and job type"),
 ):
     """
        Fetch job posts with optional filters and pagination.
@@ -58,6 +73,16 @@ async def get_jobs(
            experience_level (ExperienceLevelEnum): Filter jobs by experience level.
            job_ad_title (str): Filter jobs by job title (case-insensitive).
            offered_salary (DesiredSalaryEnum): Filter jobs by salary range.
+           job_type (ContractTypeEnum): Filter jobs by contract type.
+           remote_work (RemoteWorkEnum): Filter jobs by remote work option.
+           sector (IndustryEnum): Filter jobs by business sector.
+           education_level_required (EducationLevelEnum): Filter jobs by required education level.
+           after (str): Cursor returned as next_cursor by the previous page, page is ignored when set.
+           count (CountModeEnum): auto (estimated or briefly cached total), exact, or none to skip counting.
+           fields (str): Comma-separated fields to return, or "summary" for the list view fields.
+           q (str): Keyword search over the title, key skills and descriptions, results ranked by relevance.
+           facets (bool): Add the counts per value of region, offered_salary, experience_level and job_type, each
+               computed with the other active filters.
 
        Returns:
            dict: Paginated job posts with metadata.\n
@@ -70,6 +95,15 @@ async def get_jobs(
         experience_level=experience_level,
         job_ad_title=job_ad_title,
         offered_salary=offered_salary,
+        job_type=job_type,
+        remote_work=remote_work,
+        sector=sector,
+        education_level_required=education_level_required,
+        after=after,
+        count=count,
+        fields=fields,
+        q=q,
+        facets=facets,
     )
 
 
@@ -88,8 +122,11 @@ async def get_applications(
         page: int = Query(1, ge=1, description="The current page number, starting from 1"),
         limit: int = Query(10, ge=1, le=100, description="The number of applications per page, (max 100)"),
         job_ad_title: Optional[str] = Query(None, description="Filter jobs by job title (case-insensitive)."),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
         current_user=Depends(get_current_user)):
-    return await CandidateService.get_applications(page, limit, job_ad_title, current_user)
+    return await CandidateService.get_applications(page, limit, job_ad_title, current_user, after=after,
+                                                   count=count)
 
 
 @router.patch('/applications/{application_id}')
@@ -1,46 +1,78 @@
+from typing import Optional
+
 from fastapi import APIRouter
 from fastapi.params import Query
 
+from models.export import ExportCollectionEnum, ExportFormatEnum
+from models.pagination import CountModeEnum
 from services.api_data import ApiService
+from services.export import ExportService
+from utils.response import BSONRoute
 
-router = APIRouter(tags=["Data"], prefix="/data")
+router = APIRouter(tags=["Data"], prefix="/data", route_class=BSONRoute)
 
 
 @router.get('/job_posts')
 async def get_job_posts(
         limit: int = Query(100, ge=1, description="Number of jobs to return"),
         page: int = Query(1, ge=1, description="Current page number"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
 ):
-    return await ApiService.get_all_job_posts(limit, page)
+    return await ApiService.get_all_job_posts(limit, page, after, count, fields)
 
 
 @router.get('/employer_profiles')
 async def get_all_employer_profiles(
         limit: int = Query(100, ge=1, description="Number of employers to return"),
         page: int = Query(1, ge=1, description="Current page number"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
 ):
-    return await ApiService.get_employer_profiles(limit, page)
+    return await ApiService.get_employer_profiles(limit, page, after, count, fields)
 
 
 @router.get('/candidate_profiles')
 async def get_all_employer_profiles(
         limit: int = Query(100, ge=1, description="Number of candidates to return"),
         page: int = Query(1, ge=1, description="Current page number"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
 ):
-    return await ApiService.get_candidate_profiles(limit, page)
+    return await ApiService.get_candidate_profiles(limit, page, after, count, fields)
 
 
 @router.get('/applications')
 async def get_all_applications(
         limit: int = Query(100, ge=1, description="Number of applications to return"),
         page: int = Query(1, ge=1, description="Current page number"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
 ):
-    return await ApiService.get_applications(limit, page)
+    return await ApiService.get_applications(limit, page, after, count, fields)
 
 
 @router.get('/users')
 async def get_all_users(
         limit: int = Query(100, ge=1, description="Number of users to return"),
         page: int = Query(1, ge=1, description="Current page number"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
+):
+    return await ApiService.get_all_users(limit, page, after, count, fields)
+
+
+@router.get('/export/{collection}')
+async def export_collection(
+        collection: ExportCollectionEnum,
+        format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, description="One JSON document or CSV row per line"),
+        gzip: bool = Query(False, description="Compress the export with gzip"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to export, or "summary"'),
 ):
-    return await ApiService.get_all_users(limit, page)
+    """Stream a whole collection, without paging, for BI and bulk jobs."""
+    return ExportService.export_collection(collection, format, gzip, fields)
@@ -6,9 +6,12 @@ from fastapi.params import Query
 from core.security import check_employer_role
 from models.application import StatusEnum
 from models.job_post import JobPost
+from models.pagination import CountModeEnum
 from services.employer import EmployerService, UpdateEmployerProfile
+from utils.response import BSONRoute
 
-router = APIRouter(tags=["Employers"], prefix="/employer")
+router = APIRouter(tags=["Employers"], prefix="/employer", dependencies=[Depends(check_employer_role)],
+                   route_class=BSONRoute)
 
 
 @router.post('/create_job_post')
@@ -20,9 +23,14 @@ async def create_job_post(job_post: JobPost, current_user=Depends(check_employer
 async def get_job_post(
         page: int = Query(1, ge=1, description="Page Number"),
         limit: int = Query(10, ge=1, le=100),
-        job_title: str | None = None,
+        job_title: str | None = Query(None, description="Filter job posts by title (case-insensitive)"),
+        after: Optional[str] = Query(None, description="next_cursor of the previous page, replaces page"),
+        count: CountModeEnum = Query(CountModeEnum.AUTO, description="How to compute total_count"),
+        fields: Optional[str] = Query(None, description='Comma-separated fields to return, or "summary"'),
+        q: Optional[str] = Query(None, description="Keywords searched in the title, key skills and descriptions"),
         current_user=Depends(check_employer_role)):
-    return await EmployerService.get_job_posts(page, limit, job_title, current_user=current_user)
+    return await EmployerService.get_job_posts(page, limit, job_title, current_user=current_user, after=after,
+                                               count=count, fields=fields, q=q)
 
 
 @router.get('/me/profile')
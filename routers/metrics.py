@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from core.metrics import metrics
+from utils.response import BSONRoute
+
+router = APIRouter(tags=["Metrics"], prefix="/metrics", route_class=BSONRoute)
+
+
+@router.get('/')
+async def get_metrics():
+    return metrics.snapshot()
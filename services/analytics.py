@@ -1,5 +1,5 @@
 from core.database import candidate_profile, employer_profile, applications, job_posts
-from utils.transform import objectid_to_str
+from utils.concurrency import gather
 
 
 # helper functions
@@ -59,31 +59,42 @@ class AnalyticsService:
             "regional_distribution": regions_data,
         }
 
+    # The statistics aggregate whole collections, they wait as long as they take rather than query_timeout_seconds
     @staticmethod
     async def get_overall_statistics():
-        # Total candidates registered
-        total_candidates = await candidate_profile.count_documents({})
-
-        # Total Employers registered
-        total_employers = await employer_profile.count_documents({})
-
-        # Total Applications submitted
-        applications_submitted = await applications.count_documents({})
-
-        # Total Job posts submitted
-        job_posts_submitted = await job_posts.count_documents({})
-
-        # Application Status breakdown
-        status_breakdown = await applications.aggregate([
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-        ]).to_list()
-
-        # Top Industries by Job Posts
-        top_industries = await job_posts.aggregate([
-            {"$group": {"_id": "$job_category", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 5},
-        ]).to_list()
+        (
+            total_candidates,
+            total_employers,
+            applications_submitted,
+            job_posts_submitted,
+            status_breakdown,
+            top_industries,
+        ) = await gather(
+            # Total candidates registered
+            candidate_profile.count_documents({}),
+
+            # Total Employers registered
+            employer_profile.count_documents({}),
+
+            # Total Applications submitted
+            applications.count_documents({}),
+
+            # Total Job posts submitted
+            job_posts.count_documents({}),
+
+            # Application Status breakdown
+            applications.aggregate([
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ]).to_list(),
+
+            # Top Industries by Job Posts
+            job_posts.aggregate([
+                {"$group": {"_id": "$job_category", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+                {"$limit": 5},
+            ]).to_list(),
+            timeout=None,
+        )
 
         print(top_industries)
 
@@ -100,43 +111,53 @@ class AnalyticsService:
 
     @staticmethod
     async def get_candidate_overall_statistics():
-        # Total candidates
-        total_candidates = await candidate_profile.count_documents({})
-
-        # By experience level
-        group_by_experience_level = await candidate_profile.aggregate([
-            {"$unwind": "$skills.skill_description"},
-            {"$group": {"_id": "$skills.skill_description", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list()
-
-        # By education level
-        group_by_education_level = await candidate_profile.aggregate([
-            {"$unwind": "$profile_cv.education"},
-            {"$group": {"_id": "$profile_cv.education.degree", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list()
-
-        # By Geographical mobility/region
-        group_by_region = await candidate_profile.aggregate([
-            {"$unwind": "$job_criteria.geographical_mobility"},
-            {"$group": {"_id": "$job_criteria.geographical_mobility", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list()
-
-        # By Top Languages known
-        top_languages_known = await candidate_profile.aggregate([
-            {"$unwind": "$skills.spoken_languages"},
-            {"$group": {"_id": "$skills.spoken_languages.language", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list()
-
-        # Popular job types
-        popular_job_types = await candidate_profile.aggregate([
-            {"$unwind": "$job_criteria.seeked_jobs"},
-            {"$group": {"_id": "$job_criteria.seeked_jobs", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list()
+        (
+            total_candidates,
+            group_by_experience_level,
+            group_by_education_level,
+            group_by_region,
+            top_languages_known,
+            popular_job_types,
+        ) = await gather(
+            # Total candidates
+            candidate_profile.count_documents({}),
+
+            # By experience level
+            candidate_profile.aggregate([
+                {"$unwind": "$skills.skill_description"},
+                {"$group": {"_id": "$skills.skill_description", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(),
+
+            # By education level
+            candidate_profile.aggregate([
+                {"$unwind": "$profile_cv.education"},
+                {"$group": {"_id": "$profile_cv.education.degree", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(),
+
+            # By Geographical mobility/region
+            candidate_profile.aggregate([
+                {"$unwind": "$job_criteria.geographical_mobility"},
+                {"$group": {"_id": "$job_criteria.geographical_mobility", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(),
+
+            # By Top Languages known
+            candidate_profile.aggregate([
+                {"$unwind": "$skills.spoken_languages"},
+                {"$group": {"_id": "$skills.spoken_languages.language", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(),
+
+            # Popular job types
+            candidate_profile.aggregate([
+                {"$unwind": "$job_criteria.seeked_jobs"},
+                {"$group": {"_id": "$job_criteria.seeked_jobs", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(),
+            timeout=None,
+        )
 
         return {
             "total_candidates": total_candidates,
@@ -149,22 +170,25 @@ class AnalyticsService:
 
     @staticmethod
     async def get_employers_overall_statistics():
-        # Total number of employers
-        total_employers = await employer_profile.count_documents({})
-
-        employers_by_industry = await employer_profile.aggregate([
-            {"$unwind": "$company_industry"},
-            {"$group": {"_id": "$company_industry", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list()
-
-        employers_by_size = await get_employers_by_size()
-
-        # geographical_regions of employers
-        popular_regions_by_employers = await employer_profile.aggregate([
-            {"$group": {"_id": "$city", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list(None)
+        total_employers, employers_by_industry, employers_by_size, popular_regions_by_employers = await gather(
+            # Total number of employers
+            employer_profile.count_documents({}),
+
+            employer_profile.aggregate([
+                {"$unwind": "$company_industry"},
+                {"$group": {"_id": "$company_industry", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(),
+
+            get_employers_by_size(),
+
+            # geographical_regions of employers
+            employer_profile.aggregate([
+                {"$group": {"_id": "$city", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None),
+            timeout=None,
+        )
 
         return {
             "total_employers": total_employers,
@@ -175,37 +199,47 @@ class AnalyticsService:
 
     @staticmethod
     async def get_job_posts_overall_statistics():
-        total_job_posts = await job_posts.count_documents({})
-
-        # jobs by Education Level required.
-        jobs_by_education_level = await job_posts.aggregate([
-            {"$group": {"_id": "$education_level_required", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list(None)
-
-        # jobs by business sector
-        jobs_by_business_sector = await job_posts.aggregate([
-            {"$group": {"_id": "$sector", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list(None)
-
-        # Jobs by job_category
-        job_by_job_category = await job_posts.aggregate([
-            {"$group": {"_id": "$job_type", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list(None)
-
-        # Jobs by Region
-        jobs_by_region = await job_posts.aggregate([
-            {"$group": {"_id": "$region", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list(None)
-
-        # Jobs by experience_level_required
-        jobs_by_experience_level_required = await job_posts.aggregate([
-            {"$group": {"_id": "$experience_level", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]).to_list(None)
+        (
+            total_job_posts,
+            jobs_by_education_level,
+            jobs_by_business_sector,
+            job_by_job_category,
+            jobs_by_region,
+            jobs_by_experience_level_required,
+        ) = await gather(
+            job_posts.count_documents({}),
+
+            # jobs by Education Level required.
+            job_posts.aggregate([
+                {"$group": {"_id": "$education_level_required", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None),
+
+            # jobs by business sector
+            job_posts.aggregate([
+                {"$group": {"_id": "$sector", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None),
+
+            # Jobs by job_category
+            job_posts.aggregate([
+                {"$group": {"_id": "$job_type", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None),
+
+            # Jobs by Region
+            job_posts.aggregate([
+                {"$group": {"_id": "$region", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None),
+
+            # Jobs by experience_level_required
+            job_posts.aggregate([
+                {"$group": {"_id": "$experience_level", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None),
+            timeout=None,
+        )
 
         return {
             "total_job_posts": total_job_posts,
@@ -218,73 +252,15 @@ class AnalyticsService:
 
     @staticmethod
     async def get_applications_overall_statistics():
-        total_applications = await applications.count_documents({})
-
-        # Group the applications by the status
-        applications_by_status_level = await applications.aggregate([
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-        ]).to_list(None)
-
-        average_applications_per_job_posts = await applications.aggregate([
-            {"$lookup": {
-                "from": "job_posts",
-                "localField": "job_post_id",
-                "foreignField": "_id",
-                "as": "applications",
-            }},
-            {
-                "$project": {
-                    "job_ad_title": 1,
-                    "applications_count": {"$size": "$applications"},
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "average_applications": {"$avg": "$applications_count"},
-                }
-            }
-        ]).to_list(None)
-
-        top_job_posts_by_applications = await applications.aggregate([
-            {"$lookup": {
-                "from": "job_posts",
-                "localField": "job_post_id",
-                "foreignField": "_id",
-                "as": "applications",
-            }},
-            {
-                "$project": {
-                    "job_ad_title": 1,
-                    "applications_count": {"$size": "$applications"},
-                }
-            },
-            {"$sort": {"applications_count": -1}},
-            {"$limit": 5}
-        ]).to_list(None)
-
-        conversion_rates = objectid_to_str(await applications.aggregate([
-            {
-                "$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "accepted_count": {"$sum": {"$cond": [{"$eq": ["$_id", "Accepted"]}, 1, 0]}},
-                    "rejected_count": {"$sum": {"$cond": [{"$eq": ["$_id", "Rejected"]}, 1, 0]}}
-                }
-            },
-            {
-                "$project": {
-                    "conversion_rate": {
-                        "$divide": ["$accepted_count", {"$add": ["$accepted_count", "$rejected_count"]}]
-                    }
-                }
-            }
-        ]).to_list(length=None))
+        total_applications, applications_by_status_level = await gather(
+            applications.count_documents({}),
+
+            # Group the applications by the status
+            applications.aggregate([
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ]).to_list(None),
+            timeout=None,
+        )
 
         return {
             "total_applications": total_applications,
@@ -1,16 +1,84 @@
+import asyncio
+import codecs
+import csv
+import json
 from datetime import timedelta, datetime, timezone
 
 from bson import ObjectId
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
 from starlette import status
 
 from core.config import settings
 from core.database import user_collection, employer_profile, candidate_profile
-from core.security import hash_password, verify_password, create_jwt_token
+from core.security import hash_password_async, verify_password_async, create_jwt_token
 from models.employer import CreateEmployer
 from models.user import UserCreate, RoleEnum
 
+BULK_IMPORT_BATCH_SIZE = 500
+# Row read in place of the first line that isn't UTF-8, the import stops there
+UNDECODABLE_ROW = object()
+
+
+# helper functions
+def build_candidate_profile(candidate_id):
+    return {
+        "candidate_id": candidate_id,
+        "profile_cv": {
+            "picture": None,
+            "cv_file": None,
+            "experience": [],
+            "education": [],
+            "linkedin": None,
+        },
+        "job_criteria": None,
+        "skills": {
+            "skill_description": None,
+            "spoken_languages": [],
+            "expertise": None
+        },
+        "created_at": datetime.now(timezone.utc)
+    }
+
+
+def read_import_rows(upload: UploadFile):
+    """Yield (row number, row) from a CSV or JSONL upload, line by line, row being None when it can't be parsed.
+
+    The upload is decoded as it is read, the first line that isn't UTF-8 yields UNDECODABLE_ROW and ends the rows.
+    """
+    lines = codecs.iterdecode(upload.file, "utf-8")
+    row_number = 0
+    try:
+        if (upload.filename or "").lower().endswith(".csv") or upload.content_type == "text/csv":
+            for row_number, row in enumerate(csv.DictReader(lines), start=1):
+                # DictReader files the cells past the header under a None key
+                yield row_number, None if None in row else row
+            return
+
+        for row_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row_number, row if isinstance(row, dict) else None
+    except UnicodeDecodeError:
+        yield row_number + 1, UNDECODABLE_ROW
+
+
+def read_import_batches(upload: UploadFile):
+    batch = []
+    for row in read_import_rows(upload):
+        batch.append(row)
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 
 class AuthService:
     @staticmethod
@@ -21,7 +89,7 @@ class AuthService:
             raise HTTPException(status_code=400, detail="Email already registered")
 
         # Hash the user's password
-        user.password = hash_password(user.password)
+        user.password = await hash_password_async(user.password)
 
         # Build user data
         user_data = {
@@ -39,24 +107,7 @@ class AuthService:
         created_user = await user_collection.find_one({"_id": new_user.inserted_id})
 
         if user_type == RoleEnum.CANDIDATE:
-            default_profile_data = {
-                "candidate_id": (created_user["_id"]),
-                "profile_cv": {
-                    "picture": None,
-                    "cv_file": None,
-                    "experience": [],
-                    "education": [],
-                    "linkedin": None,
-                },
-                "job_criteria": None,
-                "skills": {
-                    "skill_description": None,
-                    "spoken_languages": [],
-                    "expertise": None
-                },
-                "created_at": datetime.now(timezone.utc)
-            }
-            await candidate_profile.insert_one(default_profile_data)
+            await candidate_profile.insert_one(build_candidate_profile(created_user["_id"]))
 
         return {
             "id": str(created_user["_id"]),
@@ -67,6 +118,101 @@ class AuthService:
             "message": "User Profile created successfully"
         }
 
+    @staticmethod
+    async def bulk_register_candidates(upload: UploadFile):
+        report = []
+        for batch in read_import_batches(upload):
+            report.extend(await AuthService.register_candidates_batch(batch))
+
+        return {
+            "created": sum(1 for row in report if row["status"] == "created"),
+            "duplicates": sum(1 for row in report if row["status"] == "duplicate"),
+            "invalid": sum(1 for row in report if row["status"] == "invalid"),
+            "rows": report,
+        }
+
+    @staticmethod
+    async def register_candidates_batch(batch):
+        report = {}
+        candidates = []
+        seen_emails = set()
+
+        # Validate the rows and drop the emails repeated within the batch
+        for row_number, row in batch:
+            if row is UNDECODABLE_ROW:
+                report[row_number] = {"row": row_number, "status": "invalid",
+                                      "detail": "Row is not valid UTF-8, the rows after it were not read"}
+                continue
+            if row is None:
+                report[row_number] = {"row": row_number, "status": "invalid", "detail": "Row could not be parsed"}
+                continue
+            try:
+                user = UserCreate(**row)
+            except ValidationError as e:
+                report[row_number] = {"row": row_number, "email": row.get("email"), "status": "invalid",
+                                      "detail": e.errors(include_url=False, include_context=False)}
+                continue
+            if user.email in seen_emails:
+                report[row_number] = {"row": row_number, "email": user.email, "status": "duplicate"}
+                continue
+            seen_emails.add(user.email)
+            candidates.append((row_number, user))
+
+        # One query for every email of the batch already registered
+        registered = {
+            user["email"]
+            async for user in user_collection.find({"email": {"$in": list(seen_emails)}}, {"email": 1})
+        }
+        for row_number, user in candidates:
+            if user.email in registered:
+                report[row_number] = {"row": row_number, "email": user.email, "status": "duplicate"}
+        candidates = [(row_number, user) for row_number, user in candidates if user.email not in registered]
+
+        # Hash on the password executor, a few at a time so logins still get a worker
+        hashed_passwords = []
+        for start in range(0, len(candidates), settings.password_hash_workers):
+            window = candidates[start:start + settings.password_hash_workers]
+            hashed_passwords.extend(await asyncio.gather(*(hash_password_async(user.password) for _, user in window)))
+
+        users_data = [
+            {
+                "_id": ObjectId(),
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "email": user.email,
+                "password": hashed_password,
+                "role": RoleEnum.CANDIDATE.value,
+            }
+            for (_, user), hashed_password in zip(candidates, hashed_passwords)
+        ]
+
+        # Unordered inserts keep going past the rows rejected by a concurrent registration
+        write_errors = {}
+        if users_data:
+            try:
+                await user_collection.insert_many(users_data, ordered=False)
+            except BulkWriteError as e:
+                write_errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+
+        created_ids = []
+        for index, ((row_number, user), user_data) in enumerate(zip(candidates, users_data)):
+            if index in write_errors:
+                if write_errors[index].get("code") == 11000:
+                    report[row_number] = {"row": row_number, "email": user.email, "status": "duplicate"}
+                else:
+                    report[row_number] = {"row": row_number, "email": user.email, "status": "failed",
+                                          "detail": write_errors[index].get("errmsg")}
+                continue
+            created_ids.append(user_data["_id"])
+            report[row_number] = {"row": row_number, "email": user.email, "status": "created",
+                                  "id": str(user_data["_id"])}
+
+        if created_ids:
+            await candidate_profile.insert_many([build_candidate_profile(user_id) for user_id in created_ids],
+                                                ordered=False)
+
+        return [report[row_number] for row_number, _ in batch]
+
     @staticmethod
     async def register_employer(user: UserCreate, employer: CreateEmployer):
         # Register the employer as a user with the "employer" role
@@ -117,7 +263,7 @@ class AuthService:
                 detail="Database connection error",
             )
 
-        if not user or not verify_password(form_data.password, user['password']):
+        if not user or not await verify_password_async(form_data.password, user['password']):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -5,13 +5,22 @@ from bson import ObjectId
 from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 
-from core.database import candidate_profile, job_posts, applications
+from core.database import CASE_INSENSITIVE, candidate_profile, job_posts, applications
 from core.security import get_current_user
 from models.application import StatusEnum
 from models.candidate import Education, Experience, RegionEnum, ExperienceLevelEnum, DesiredSalaryEnum, Skills, \
-    SpokenLanguage
+    SpokenLanguage, ContractTypeEnum, EducationLevelEnum
+from models.employer import IndustryEnum
+from models.job_post import RemoteWorkEnum
+from models.pagination import CountModeEnum
+from services.job_catalog import job_catalog
+from services.job_facets import FACET_FIELDS, find_with_facets
+from services.job_search_cache import job_search_cache
+from services.paginate import case_insensitive_match, count_total, decode_cursor, find_by_ids, keyset_query, \
+    next_cursor, page_cursor, text_search
+from services.projection import build_projection
+from utils.concurrency import gather
 from utils.save_file import save_file
-from utils.transform import objectid_to_str
 
 
 class CandidateBasicInformation(BaseModel):
@@ -63,6 +72,9 @@ class CandidateService:
             return {
                 "message": "Candidate Profile retrieved successfully",
                 "candidate_profile": {
+                    "first_name": current_user.get("first_name"),
+                    "last_name": current_user.get("last_name"),
+                    "email": current_user.get("email"),
                     # todo :: returning the profile_photo and also cv_file to the end user.
                     "profile_cv": candidate_information.get("profile_cv", {}),
                     "criteria": candidate_information.get("criteria", {}),
@@ -286,43 +298,96 @@ class CandidateService:
                               experience_level: Optional[ExperienceLevelEnum],
                               job_ad_title: Optional[str],
                               offered_salary: Optional[DesiredSalaryEnum],
+                              after: Optional[str] = None,
+                              count: CountModeEnum = CountModeEnum.AUTO,
+                              fields: Optional[str] = None,
+                              q: Optional[str] = None,
+                              job_type: Optional[ContractTypeEnum] = None,
+                              remote_work: Optional[RemoteWorkEnum] = None,
+                              sector: Optional[IndustryEnum] = None,
+                              education_level_required: Optional[EducationLevelEnum] = None,
+                              facets: bool = False,
                               ):
 
         search_query = {}
 
         if region:
             search_query["region"] = region.value
-        if city:
-            search_query["city"] = city
         if experience_level:
             search_query["experience_level"] = experience_level.value
-        if job_ad_title:
-            search_query["job_ad_title"] = job_ad_title
         if offered_salary:
             search_query["offered_salary"] = offered_salary.value
+        if job_type:
+            search_query["job_type"] = job_type.value
+        if remote_work:
+            search_query["remote_work"] = remote_work.value
+        if sector:
+            search_query["sector"] = sector.value
+        if education_level_required:
+            search_query["education_level_required"] = education_level_required.value
+        search_query = text_search(search_query, q)
+        # City and title match whatever their case, through the city_id_ci and job_ad_title_id_ci indexes
+        search_query, collation = case_insensitive_match(search_query, {"city": city, "job_ad_title": job_ad_title})
+        projection = build_projection("job_posts", fields)
+
+        # Exact counts are never served from the cache
+        cache_key = None
+        if count != CountModeEnum.EXACT:
+            cache_key = job_search_cache.key(search_query, page, limit, after, count, fields, facets)
+            cached_response = job_search_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+
+        # Enum filters only, the catalog filters and counts in memory and MongoDB serves the page by _id
+        catalog_page = None
+        if job_catalog.can_filter(search_query) and count != CountModeEnum.EXACT:
+            catalog_page = job_catalog.page(search_query, (page - 1) * limit, limit,
+                                            decode_cursor(after) if after else None)
+
+        if catalog_page is not None:
+            page_ids, total_jobs = catalog_page
+            jobs_posted = await find_by_ids(job_posts, page_ids, projection)
+            # Posts created by other processes join the catalog at its next sync
+            total_jobs_exact = False
+            if count == CountModeEnum.NONE:
+                total_jobs = None
+            facet_counts = job_catalog.facet_counts(search_query, FACET_FIELDS) if facets else None
+        elif facets:
+            # The page is an indexed find, the total and facet counts come from one aggregation run alongside it
+            jobs_posted, total_jobs, facet_counts = await find_with_facets(job_posts, search_query, projection,
+                                                                           page, limit, after, collation)
+            total_jobs_exact = True
+            if count == CountModeEnum.NONE:
+                total_jobs, total_jobs_exact = None, False
+        else:
+            jobs_cursor = page_cursor(job_posts, search_query, projection, page, limit, after, collation)
+            jobs_posted, (total_jobs, total_jobs_exact) = await gather(
+                jobs_cursor.to_list(length=limit),
+                count_total(job_posts, search_query, count, collation),
+            )
 
-        skip = (page - 1) * limit
-
-        jobs_cursor = job_posts.find(search_query).skip(skip).limit(limit)
-        jobs_posted = objectid_to_str(await jobs_cursor.to_list(length=limit))
-
-        total_jobs = await job_posts.count_documents(search_query)
-
-        return {
-            "page": page,
+        response = {
+            "page": None if after else page,
             "limit": limit,
             "total_jobs": total_jobs,
+            "total_jobs_exact": total_jobs_exact,
             "jobs": jobs_posted,
+            "next_cursor": None if q else next_cursor(jobs_posted, limit),
         }
+        if facets:
+            response["facets"] = facet_counts
+        if cache_key is not None:
+            job_search_cache.set(cache_key, response)
+        return response
 
-        jobs_posted = objectid_to_str(await job_posts.find().to_list(1000))
+        jobs_posted = await job_posts.find().to_list(1000)
         return jobs_posted
 
     @staticmethod
     async def get_job_post(job_id):
         try:
             job_post = await job_posts.find_one({"_id": ObjectId(job_id)})
-            return objectid_to_str(job_post)
+            return job_post
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -365,7 +430,8 @@ class CandidateService:
         }
 
     @staticmethod
-    async def get_applications(page: int, limit: int, job_ad_title: Optional[str], current_user):
+    async def get_applications(page: int, limit: int, job_ad_title: Optional[str], current_user,
+                               after: Optional[str] = None, count: CountModeEnum = CountModeEnum.AUTO):
 
         candidate_id = current_user["_id"]
 
@@ -375,11 +441,15 @@ class CandidateService:
         # Match candidate ID and filter by job_ad_title if provided
         match_stage = {"$match": {"candidate_id": candidate_id}}
         if job_ad_title:
-            match_stage["$match"]["job_details.job_ad_title"] = {"$regex": job_ad_title,
-                                                                 "$options": "i"}  # Case-insensitive
+            # Resolved to the ids of the applied jobs with that title, matched whatever its case, so that the filter
+            # applies before the lookups and the total
+            applied_job_ids = await applications.distinct("job_id", match_stage["$match"])
+            match_stage["$match"]["job_id"] = {"$in": await job_posts.distinct(
+                "_id", {"_id": {"$in": applied_job_ids}, "job_ad_title": job_ad_title}, collation=CASE_INSENSITIVE)}
 
         pipeline = [
-            match_stage,
+            {"$match": keyset_query(match_stage["$match"], after)},
+            {"$sort": {"_id": 1}},
 
             # Lookup job details from job_posts
             {
@@ -419,27 +489,24 @@ class CandidateService:
                 }
             },
 
-            # Pagination
-            {"$skip": skip},
+            # Pagination, the cursor already bounds the match stage
+            *([] if after else [{"$skip": skip}]),
             {"$limit": limit}
         ]
 
-        # Fetch total count for pagination metadata
-        total_count_pipeline = [
-            match_stage,
-            {"$count": "total_count"}
-        ]
-        total_count_result = await applications.aggregate(total_count_pipeline).to_list(1)
-        total_count = total_count_result[0]["total_count"] if total_count_result else 0
-
-        # Fetch paginated data
-        applications_for_user = objectid_to_str(await applications.aggregate(pipeline).to_list(limit))
+        # Fetch the total count for pagination metadata along with the paginated data
+        (total_count, total_count_exact), applications_for_user = await gather(
+            count_total(applications, match_stage["$match"], count),
+            applications.aggregate(pipeline).to_list(limit),
+        )
 
         return {
-            "page": page,
+            "page": None if after else page,
             "limit": limit,
             "total_count": total_count,
+            "total_count_exact": total_count_exact,
             "applications": applications_for_user,
+            "next_cursor": next_cursor(applications_for_user, limit),
         }
 
     @staticmethod
@@ -11,7 +11,13 @@ from core.security import check_employer_role
 from models.application import StatusEnum
 from models.employer import IndustryEnum, NumberOfEmployeesEnum
 from models.job_post import JobPost
-from utils.transform import objectid_to_str
+from models.pagination import CountModeEnum
+from services.job_catalog import job_catalog
+from services.job_search_cache import job_search_cache
+from services.paginate import case_insensitive_match, count_total, next_cursor, page_cursor, text_search, \
+    total_pages
+from services.projection import build_projection
+from utils.concurrency import gather
 
 
 class UpdateEmployerProfile(BaseModel):
@@ -32,7 +38,7 @@ class EmployerService:
     async def get_profile(current_user):
         employer_id = current_user['_id']
 
-        employer_information = objectid_to_str(await employer_profile.find_one({'employer_id': employer_id}))
+        employer_information = await employer_profile.find_one({'employer_id': employer_id})
 
         return employer_information
 
@@ -49,7 +55,7 @@ class EmployerService:
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail='Employer profile not found.')
 
-        updated_info = objectid_to_str(await employer_profile.find_one({'employer_id': employer_id}))
+        updated_info = await employer_profile.find_one({'employer_id': employer_id})
         if updated_info:
             updated_info.pop("_id", None)
         return updated_info
@@ -64,6 +70,8 @@ class EmployerService:
         job_post_data['created_at'] = datetime.now(timezone.utc)
 
         result = await job_posts.insert_one(job_post_data)
+        job_catalog.add(job_post_data)
+        job_search_cache.invalidate()
 
         job_post_response = {
             "job_ad_title": job_post_data["job_ad_title"],
@@ -78,31 +86,34 @@ class EmployerService:
         return job_post_response
 
     @staticmethod
-    async def get_job_posts(page: int, limit: int, job_title: str, current_user):
+    async def get_job_posts(page: int, limit: int, job_title: str, current_user, after: Optional[str] = None,
+                            count: CountModeEnum = CountModeEnum.AUTO, fields: Optional[str] = None,
+                            q: Optional[str] = None):
         employer_id = current_user['_id']
 
-        skip = (page - 1) * limit
         # Build the query you are using to find the filter the data from db.
         query = {'employer_id': employer_id}
-        if job_title:
-            # To  mean I am adding the property of regex which will case-insensitive.
-            query['job_title'] = {"$regex": job_title, "$options": "i"}
-
-        # Fetch the paginated data
-        job_posts_info = await job_posts.find(query).skip(skip).limit(limit).to_list(limit)
-
-        # Count the total number of documents matching the query
-        total_count = await job_posts.count_documents(query)
-
-        job_posts_raw = objectid_to_str(job_posts_info)
+        query = text_search(query, q)
+        # The title matches whatever its case, through the employer_id_job_ad_title_id_ci index
+        query, collation = case_insensitive_match(query, {"job_ad_title": job_title})
+
+        # Fetch the paginated data, counting the total number of documents matching the query along with it
+        job_posts_cursor = page_cursor(job_posts, query, build_projection("job_posts", fields), page, limit, after,
+                                       collation)
+        job_posts_info, (total_count, total_count_exact) = await gather(
+            job_posts_cursor.to_list(limit),
+            count_total(job_posts, query, count, collation),
+        )
 
         return {
-            "data": job_posts_raw,
+            "data": job_posts_info,
             "pagination": {
-                "page": page,
+                "page": None if after else page,
                 "page_size": limit,
                 "total_count": total_count,
-                "total_pages": (total_count + limit - 1) // limit,
+                "total_count_exact": total_count_exact,
+                "total_pages": total_pages(total_count, limit),
+                "next_cursor": None if q else next_cursor(job_posts_info, limit),
             }
         }
 
@@ -166,7 +177,7 @@ class EmployerService:
             }
         ]
 
-        summary_for_employer = objectid_to_str(await applications.aggregate(pipeline).to_list(100))
+        summary_for_employer = await applications.aggregate(pipeline).to_list(100)
         return summary_for_employer
 
     @staticmethod
@@ -0,0 +1,118 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+from core.database import db
+from models.export import ExportCollectionEnum, ExportFormatEnum
+from services.projection import build_projection
+from utils.response import dumps_bson
+
+EXPORT_BATCH_SIZE = 2000
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv",
+}
+
+# Password hashes never leave the database through an export
+EXPORT_PROJECTIONS = {
+    ExportCollectionEnum.USERS: {"password": 0},
+}
+
+
+# Documents are encoded like the API responses, through orjson and the BSON default of utils/response.py
+def csv_cell(value):
+    if isinstance(value, (dict, list)):
+        return dumps_bson(value).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def ndjson_rows(cursor):
+    async for document in cursor:
+        yield dumps_bson(document, orjson.OPT_APPEND_NEWLINE)
+
+
+async def csv_columns(collection, projection: Optional[dict]) -> list:
+    """The requested top-level fields, or every top-level field found in the collection, _id first."""
+    if projection and any(included for included in projection.values()):
+        names = [name.split(".")[0] for name in projection]
+    else:
+        # The documents of a collection don't all have the same fields, the union is gathered on the server
+        pipeline = [
+            {"$project": {"fields": {"$objectToArray": "$$ROOT"}}},
+            {"$unwind": "$fields"},
+            {"$group": {"_id": "$fields.k"}},
+        ]
+        excluded = {name for name, included in (projection or {}).items() if not included}
+        names = sorted([field["_id"] async for field in collection.aggregate(pipeline) if field["_id"] not in excluded])
+    return list(dict.fromkeys(["_id", *names]))
+
+
+async def csv_rows(cursor, collection, projection: Optional[dict]):
+    """CSV rows with one column per field, empty when a document lacks it, nested values are written as JSON."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=await csv_columns(collection, projection), extrasaction="ignore")
+    writer.writeheader()
+    async for document in cursor:
+        writer.writerow({key: csv_cell(value) for key, value in document.items()})
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def chunked(rows, compress: bool):
+    """Group the encoded rows into CHUNK_SIZE writes, gzip-compressed on the fly when asked."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    pending = []
+    size = 0
+    async for row in rows:
+        pending.append(row)
+        size += len(row)
+        if size >= CHUNK_SIZE:
+            chunk = b"".join(pending)
+            pending, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+    chunk = b"".join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+class ExportService:
+    @staticmethod
+    def export_collection(collection: ExportCollectionEnum, export_format: ExportFormatEnum, compress: bool,
+                          fields: Optional[str] = None):
+        # Only one batch of documents and one chunk of output are held in memory, whatever the collection size
+        projection = build_projection(collection.value, fields) or EXPORT_PROJECTIONS.get(collection)
+        documents = db.get_collection(collection.value)
+        cursor = documents.find({}, projection, batch_size=EXPORT_BATCH_SIZE)
+        if export_format == ExportFormatEnum.NDJSON:
+            rows = ndjson_rows(cursor)
+        else:
+            rows = csv_rows(cursor, documents, projection)
+
+        filename = f"{collection.value}.{export_format.value}"
+        media_type = MEDIA_TYPES[export_format]
+        if compress:
+            filename += ".gz"
+            media_type = "application/gzip"
+
+        return StreamingResponse(
+            chunked(rows, compress),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
@@ -0,0 +1,215 @@
+import asyncio
+import bisect
+import logging
+from datetime import timedelta
+from enum import Enum
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# The enum-valued /candidate/jobs filters, the catalog answers any combination of them
+CATALOG_FIELDS = ("region", "experience_level", "offered_salary", "job_type", "remote_work", "sector",
+                  "education_level_required")
+SYNC_BATCH_SIZE = 5000
+# Each sync re-reads the posts whose _id is up to this much older than the newest one synced: inserts from several
+# processes commit out of _id order, and the _ids generated within the same second aren't ordered across processes.
+# A post committed more than this after its _id was generated is only picked up at the next restart.
+SYNC_OVERLAP = timedelta(minutes=2)
+
+
+def field_values(value):
+    values = value if isinstance(value, list) else [value]
+    return [item.value if isinstance(item, Enum) else item for item in values if item is not None]
+
+
+class JobCatalog:
+    """In-process index of the job posts with one bitmap per value of each enum-valued filter.
+
+    Bit n of a bitmap stands for the n-th job post in _id order, the posts synced out of order are inserted at
+    their place and the following bits shifted. Python ints serve as the bitmaps: a filter combination is the AND
+    of one bitmap per filter, its count a popcount. Dense ints stand in for compressed bitmaps, at 500k posts one
+    bitmap weighs 62KB.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._ids = []
+        self._positions = {}
+        self._all = 0
+        self._bitmaps = {field: {} for field in CATALOG_FIELDS}
+        self._last_synced_id = None
+
+    def __len__(self):
+        return self._all.bit_count()
+
+    def can_filter(self, filters: dict) -> bool:
+        return self.ready and all(field in self._bitmaps for field in filters)
+
+    def add(self, job_post: dict):
+        """Index a job post, or re-index it when it is already in the catalog.
+
+        Nothing to do before the first sync has loaded the catalog, the sync picks the post up.
+        """
+        if self.ready:
+            self._index(job_post)
+
+    def _index(self, job_post: dict):
+        position = self._positions.get(job_post["_id"])
+        if position is None:
+            position = bisect.bisect_left(self._ids, job_post["_id"])
+            if position < len(self._ids):
+                self._open_position(position)
+            self._ids.insert(position, job_post["_id"])
+            self._positions[job_post["_id"]] = position
+        else:
+            self._clear(position)
+
+        bit = 1 << position
+        self._all |= bit
+        for field in CATALOG_FIELDS:
+            bitmaps = self._bitmaps[field]
+            for value in field_values(job_post.get(field)):
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def add_many(self, job_posts: list):
+        """Index a batch of new job posts with one operation per bitmap, instead of one per post and bitmap.
+
+        The posts already in the catalog are skipped. The new bits are gathered in small ints relative to the first
+        new position, then shifted into place. The posts older than the newest one indexed are inserted one by one.
+        """
+        base = len(self._ids)
+        added = {field: {} for field in CATALOG_FIELDS}
+        new_bits = 0
+        late = []
+        for job_post in job_posts:
+            if job_post["_id"] in self._positions:
+                continue
+            if self._ids and job_post["_id"] < self._ids[-1]:
+                late.append(job_post)
+                continue
+            bit = 1 << (len(self._ids) - base)
+            self._positions[job_post["_id"]] = len(self._ids)
+            self._ids.append(job_post["_id"])
+            new_bits |= bit
+            for field in CATALOG_FIELDS:
+                for value in field_values(job_post.get(field)):
+                    added[field][value] = added[field].get(value, 0) | bit
+
+        self._all |= new_bits << base
+        for field, values in added.items():
+            bitmaps = self._bitmaps[field]
+            for value, bits in values.items():
+                bitmaps[value] = bitmaps.get(value, 0) | bits << base
+        for job_post in late:
+            self._index(job_post)
+
+    def remove(self, job_id: ObjectId):
+        position = self._positions.get(job_id)
+        if position is not None:
+            self._clear(position)
+
+    def _open_position(self, position):
+        """Shift the posts from `position` on one place up, leaving `position` free."""
+        low = (1 << position) - 1
+        self._all = self._all & low | self._all >> position << (position + 1)
+        for bitmaps in self._bitmaps.values():
+            for value, bits in bitmaps.items():
+                if bits >> position:
+                    bitmaps[value] = bits & low | bits >> position << (position + 1)
+        for job_id in self._ids[position:]:
+            self._positions[job_id] += 1
+
+    def _clear(self, position):
+        mask = ~(1 << position)
+        self._all &= mask
+        for bitmaps in self._bitmaps.values():
+            for value, bits in bitmaps.items():
+                if bits >> position & 1:
+                    bitmaps[value] = bits & mask
+
+    def match(self, filters: dict) -> int:
+        bits = self._all
+        for field, value in filters.items():
+            bits &= self._bitmaps[field].get(value, 0)
+        return bits
+
+    def page(self, filters: dict, skip: int, limit: int, after: Optional[ObjectId] = None):
+        """(ids of the page, total) for the filters, None when `after` isn't in the catalog."""
+        bits = self.match(filters)
+        total = bits.bit_count()
+        if after is not None:
+            position = self._positions.get(after)
+            if position is None:
+                return None
+            bits = bits >> (position + 1) << (position + 1)
+            skip = 0
+
+        # Lowest bit first, so that the set bits can be located with str.find
+        flags = bin(bits)[:1:-1]
+        index = -1
+        for _ in range(skip):
+            index = flags.find("1", index + 1)
+            if index < 0:
+                return [], total
+
+        ids = []
+        while len(ids) < limit:
+            index = flags.find("1", index + 1)
+            if index < 0:
+                break
+            ids.append(self._ids[index])
+        return ids, total
+
+    def facet_counts(self, filters: dict, fields) -> dict:
+        """{field: {value: count}} of the posts matching the filters, each field ignoring its own filter."""
+        counts = {}
+        for field in fields:
+            bits = self.match({other: value for other, value in filters.items() if other != field})
+            field_counts = ((value, (bits & bitmap).bit_count()) for value, bitmap in self._bitmaps[field].items())
+            counts[field] = dict(sorted(((value, count) for value, count in field_counts if count),
+                                        key=lambda item: -item[1]))
+        return counts
+
+    async def sync(self, collection):
+        """Index the job posts inserted since the last sync, by this process or any other."""
+        query = {}
+        if self._last_synced_id is not None:
+            since = self._last_synced_id.generation_time - SYNC_OVERLAP
+            query = {"_id": {"$gte": ObjectId.from_datetime(since)}}
+        projection = {field: 1 for field in CATALOG_FIELDS}
+        cursor = collection.find(query, projection).sort("_id", ASCENDING).batch_size(SYNC_BATCH_SIZE)
+        batch = []
+        async for job_post in cursor:
+            batch.append(job_post)
+            if len(batch) >= SYNC_BATCH_SIZE:
+                self._sync_batch(batch)
+                batch = []
+        if batch:
+            self._sync_batch(batch)
+        self.ready = True
+        metrics.set_gauge('job_catalog.size', len(self))
+
+    def _sync_batch(self, batch: list):
+        self.add_many(batch)
+        newest = batch[-1]["_id"]
+        if self._last_synced_id is None or newest > self._last_synced_id:
+            self._last_synced_id = newest
+
+
+job_catalog = JobCatalog()
+
+
+async def keep_job_catalog_in_sync(collection, interval: float):
+    """Load the catalog, then pick up the job posts other processes insert every `interval` seconds."""
+    while True:
+        try:
+            await job_catalog.sync(collection)
+        except PyMongoError as e:
+            logger.error("Could not sync the job catalog: %s", e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from pymongo.collation import Collation
+
+from services.paginate import page_cursor
+from utils.concurrency import gather
+
+# Filters of the job search page shown with the number of matching posts next to each value
+FACET_FIELDS = ("region", "offered_salary", "experience_level", "job_type")
+
+
+def facet_pipeline(query: dict) -> list:
+    """Counts per value of each facet field in a single aggregation.
+
+    The filters on the facet fields move into the sub-pipelines, so that the counts of each facet apply all the
+    active filters but its own, the others (city, title, keywords) stay in the first, index-backed, $match.
+    """
+    base = {field: value for field, value in query.items() if field not in FACET_FIELDS}
+    selected = {field: value for field, value in query.items() if field in FACET_FIELDS}
+    facets = {
+        field: [
+            {"$match": {other: value for other, value in selected.items() if other != field}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+        ]
+        for field in FACET_FIELDS
+    }
+    return [{"$match": base}, {"$facet": facets}]
+
+
+def facets_total(query: dict, buckets: list) -> int:
+    """Total of the query out of the buckets of the first facet field, which cover the posts missing the field too."""
+    field = FACET_FIELDS[0]
+    if field in query:
+        return sum(bucket["count"] for bucket in buckets if bucket["_id"] == query[field])
+    return sum(bucket["count"] for bucket in buckets)
+
+
+async def find_with_facets(collection, query: dict, projection: Optional[dict], page: int, limit: int,
+                           after: Optional[str], collation: Optional[Collation] = None):
+    """(page documents, total, {facet field: {value: count}}).
+
+    Sub-pipelines of $facet can't use indexes, the page is an indexed find run alongside the counts aggregation.
+    """
+    cursor = page_cursor(collection, query, projection, page, limit, after, collation)
+    documents, results = await gather(
+        cursor.to_list(length=limit),
+        collection.aggregate(facet_pipeline(query), collation=collation).to_list(1),
+    )
+    buckets = results[0] if results else {field: [] for field in FACET_FIELDS}
+    facets = {
+        field: {bucket["_id"]: bucket["count"] for bucket in buckets[field] if bucket["_id"] is not None}
+        for field in FACET_FIELDS
+    }
+    return documents, facets_total(query, buckets[FACET_FIELDS[0]]), facets
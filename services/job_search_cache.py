@@ -0,0 +1,42 @@
+from bson import json_util
+
+from core.config import settings
+from core.metrics import metrics
+from utils.cache import TTLCache
+
+
+class JobSearchCache:
+    """Responses of /candidate/jobs, keyed by the normalized filters and the requested page.
+
+    Every write to the job posts bumps the generation, which is part of the keys: the entries of older generations
+    are never read again and age out through the LRU eviction. Writes from other processes are only picked up once
+    the entries expire, after job_search_cache_ttl_seconds.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None):
+        self.generation = 0
+        self._responses = TTLCache(max_size=max_size, ttl=ttl)
+
+    def key(self, query: dict, *page_arguments) -> tuple:
+        # Taken before the queries run, a response computed across a write is stored under the old generation
+        return self.generation, json_util.dumps(query, sort_keys=True), page_arguments
+
+    def get(self, key):
+        response = self._responses.get(key)
+        if response is None:
+            metrics.increment('job_search_cache.misses')
+        else:
+            metrics.increment('job_search_cache.hits')
+        return response
+
+    def set(self, key, response: dict):
+        self._responses.set(key, response)
+
+    def invalidate(self):
+        self.generation += 1
+
+    def __len__(self):
+        return len(self._responses)
+
+
+job_search_cache = JobSearchCache(max_size=settings.job_search_cache_size, ttl=settings.job_search_cache_ttl_seconds)
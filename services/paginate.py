@@ -1,19 +1,152 @@
-from utils.transform import objectid_to_str
+import base64
+import binascii
+import re
+from typing import Optional
+
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from pymongo import ASCENDING
+from pymongo.collation import Collation
+
+from core.config import settings
+from core.database import CASE_INSENSITIVE
+from core.metrics import metrics
+from models.pagination import CountModeEnum
+from services.projection import build_projection
+from utils.cache import TTLCache
+from utils.concurrency import gather
+
+TEXT_SCORE = {"$meta": "textScore"}
+
+# Filtered totals, keyed by collection and normalized filter
+count_cache = TTLCache(max_size=settings.count_cache_size, ttl=settings.count_cache_ttl_seconds)
+
+
+# Keyset pagination, the cursor is the opaque form of the last _id of a page and the next page starts after it
+def encode_cursor(last_id: ObjectId) -> str:
+    return base64.urlsafe_b64encode(last_id.binary).decode()
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    try:
+        return ObjectId(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, InvalidId, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_query(query: dict, after: Optional[str]) -> dict:
+    if not after:
+        return query
+    return {**query, "_id": {"$gt": decode_cursor(after)}}
+
+
+def next_cursor(documents: list, limit: int) -> Optional[str]:
+    """Cursor of the page following `documents`, None once a page comes back short."""
+    if len(documents) < limit:
+        return None
+    return encode_cursor(ObjectId(documents[-1]["_id"]))
+
+
+def text_search(query: dict, q: Optional[str]) -> dict:
+    """Add a keyword search on the collection's text index to `query`."""
+    if not q:
+        return query
+    return {**query, "$text": {"$search": q}}
+
+
+def case_insensitive_match(query: dict, values: dict) -> tuple[dict, Optional[Collation]]:
+    """Add case-insensitive equality matches on `values` to `query`, returned with the collation to run it with.
+
+    Keyword searches are served by the text index, which only supports the simple collation, there the matches
+    become anchored regexes checked on the documents the text index returns.
+    """
+    values = {field: value for field, value in values.items() if value}
+    if not values:
+        return query, None
+    if "$text" in query:
+        return {**query, **{field: {"$regex": f"^{re.escape(value)}$", "$options": "i"}
+                            for field, value in values.items()}}, None
+    return {**query, **values}, CASE_INSENSITIVE
+
+
+def ensure_cursor_pageable(query: dict, after: Optional[str]):
+    if after and "$text" in query:
+        raise HTTPException(status_code=400, detail="Keyword searches are paginated with page, not after")
+
+
+def page_cursor(collection, query: dict, projection: Optional[dict], page: int, limit: int, after: Optional[str],
+                collation: Optional[Collation] = None):
+    """Cursor over one page of `query`, in _id order from `after` or `page`, by relevance for keyword searches.
+
+    Relevance pages are only addressed by `page`, the text score can't bound a range query.
+    """
+    if "$text" in query:
+        ensure_cursor_pageable(query, after)
+        cursor = collection.find(query, {**(projection or {}), "score": TEXT_SCORE}, collation=collation)
+        return cursor.sort([("score", TEXT_SCORE), ("_id", ASCENDING)]).skip((page - 1) * limit).limit(limit)
+
+    # Sorted on _id so that a page and the cursor pages following it line up
+    cursor = collection.find(keyset_query(query, after), projection, collation=collation).sort("_id", ASCENDING)
+    if not after:
+        cursor = cursor.skip((page - 1) * limit)
+    return cursor.limit(limit)
+
+
+async def find_by_ids(collection, ids: list, projection: Optional[dict]) -> list:
+    """The documents of `ids`, in the order of `ids`."""
+    documents = await collection.find({"_id": {"$in": ids}}, projection).to_list(length=len(ids))
+    by_id = {document["_id"]: document for document in documents}
+    return [by_id[document_id] for document_id in ids if document_id in by_id]
+
+
+# Total counts
+async def count_total(collection, query: dict, mode: CountModeEnum = CountModeEnum.AUTO,
+                      collation: Optional[Collation] = None):
+    """Total for the paginated responses as (total, exact), total is None when the client opted out of counting.
+
+    In auto mode unfiltered collections use the metadata estimate, reported as approximate. Filtered counts are
+    reused for count_cache_ttl_seconds: a fresh count is reported as exact, a cached one as approximate.
+    """
+    if mode == CountModeEnum.NONE:
+        return None, False
+    if mode == CountModeEnum.EXACT:
+        return await collection.count_documents(query, collation=collation), True
+    if not query:
+        return await collection.estimated_document_count(), False
+
+    key = (collection.name, json_util.dumps(query, sort_keys=True),
+           json_util.dumps(collation.document, sort_keys=True) if collation else None)
+    total = count_cache.get(key)
+    if total is not None:
+        metrics.increment('count_cache.hits')
+        return total, False
+
+    metrics.increment('count_cache.misses')
+    total = await collection.count_documents(query, collation=collation)
+    count_cache.set(key, total)
+    return total, True
+
+
+def total_pages(total: Optional[int], limit: int) -> Optional[int]:
+    return None if total is None else (total + limit - 1) // limit
 
 
 class PaginationService:
     @staticmethod
-    async def get_paginated_data(collection, limit: int = 100, page: int = 1):
-        skip = (page - 1) * limit
-        total_count = await collection.count_documents({})
-        total_pages = (total_count + limit - 1) // limit
-
-        documents = objectid_to_str(await collection.find().skip(skip).limit(limit).to_list(length=limit))
+    async def get_paginated_data(collection, limit: int = 100, page: int = 1, after: Optional[str] = None,
+                                 count: CountModeEnum = CountModeEnum.AUTO, fields: Optional[str] = None):
+        cursor = page_cursor(collection, {}, build_projection(collection.name, fields), page, limit, after)
+        (total_count, total_count_exact), documents = await gather(
+            count_total(collection, {}, count),
+            cursor.to_list(length=limit),
+        )
 
         return {
             "data": documents,
             "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
+            "total_count_exact": total_count_exact,
+            "total_pages": total_pages(total_count, limit),
+            "current_page": None if after else page,
+            "next_cursor": next_cursor(documents, limit),
         }
-
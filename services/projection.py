@@ -0,0 +1,50 @@
+import re
+from typing import Optional
+
+from fastapi import HTTPException
+
+SUMMARY = "summary"
+MAX_FIELDS = 50
+FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+# Default list views, without the long texts and the embedded arrays
+SUMMARY_FIELDS = {
+    "job_posts": ["job_ad_title", "employer_id", "sector", "job_category", "experience_level", "job_type", "region",
+                  "city", "remote_work", "offered_salary", "created_at"],
+    "employer_profiles": ["employer_id", "company_name", "city", "country", "company_industry",
+                          "number_of_employees", "created_at"],
+    "candidate_profiles": ["candidate_id", "job_criteria", "skills.skill_description", "created_at"],
+    "applications": ["candidate_id", "job_id", "job_post_id", "status", "created_at", "application_date"],
+    "users": ["first_name", "last_name", "email", "role", "created_at"],
+}
+
+# Fields that can't be requested, whatever the endpoint
+HIDDEN_FIELDS = {
+    "users": {"password"},
+}
+
+
+def build_projection(collection_name: str, fields: Optional[str]) -> Optional[dict]:
+    """Inclusion projection for a `fields=` parameter, "summary" or comma-separated paths, None for whole documents.
+
+    _id is always part of the projection, the cursor pagination relies on it.
+    """
+    if not fields:
+        return None
+
+    if fields == SUMMARY:
+        names = SUMMARY_FIELDS[collection_name]
+    else:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        invalid = [name for name in names if not FIELD_PATTERN.match(name)]
+        if invalid or not names or len(names) > MAX_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(invalid) or fields}")
+
+    hidden = [name for name in names if name.split(".")[0] in HIDDEN_FIELDS.get(collection_name, ())]
+    if hidden:
+        raise HTTPException(status_code=400, detail=f"Fields not available: {', '.join(hidden)}")
+
+    # A path under another requested one would be a path collision
+    projection = {name: 1 for name in names if not any(name.startswith(other + ".") for other in names)}
+    projection["_id"] = 1
+    return projection
@@ -0,0 +1,53 @@
+import os
+
+# The settings are read when core.config is imported, the tests never reach this server
+os.environ.update({
+    "db_url": "mongodb://localhost:1",
+    "secret_key": "test-secret",
+    "algorithm": "HS256",
+    "access_token_expire_minutes": "30",
+    "db_ensure_indexes": "false",
+    "db_min_pool_size": "0",
+    "job_catalog_enabled": "false",
+})
+
+import pytest  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+import services.auth  # noqa: E402
+import services.candidate  # noqa: E402
+import services.employer  # noqa: E402
+from core.database import DATABASE_NAME  # noqa: E402
+from services.job_catalog import job_catalog  # noqa: E402
+from services.job_search_cache import job_search_cache  # noqa: E402
+from services.paginate import count_cache  # noqa: E402
+
+# Module globals bound to the collections of core.database, by module
+COLLECTIONS = {
+    services.auth: {"user_collection": "users", "candidate_profile": "candidate_profiles",
+                    "employer_profile": "employer_profiles"},
+    services.candidate: {"job_posts": "job_posts", "applications": "applications",
+                         "candidate_profile": "candidate_profiles"},
+    services.employer: {"job_posts": "job_posts", "applications": "applications",
+                        "employer_profile": "employer_profiles", "candidate_profile": "candidate_profiles"},
+}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """An in-memory database in place of the one of core.database, with the in-process caches emptied."""
+    database = AsyncMongoMockClient()[DATABASE_NAME]
+    for module, names in COLLECTIONS.items():
+        for name, collection_name in names.items():
+            monkeypatch.setattr(module, name, database[collection_name])
+
+    count_cache.clear()
+    job_search_cache.invalidate()
+    job_catalog.__init__()
+    yield database
+    job_catalog.__init__()
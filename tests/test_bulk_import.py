@@ -0,0 +1,60 @@
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from services.auth import AuthService
+
+HEADER = b"first_name,last_name,email,gender,password\n"
+
+
+def upload(content: bytes, filename="candidates.csv"):
+    return UploadFile(io.BytesIO(content), filename=filename)
+
+
+@pytest.mark.anyio
+async def test_report_mixes_created_invalid_and_duplicate_rows(database):
+    await database.users.insert_one({"email": "taken@example.com", "role": "candidate"})
+    content = HEADER + (
+        b"Ada,Lovelace,ada@example.com,Female,secret1\n"
+        b"Bad,Email,not-an-email,Male,secret2\n"
+        b"Too,Many,cells@example.com,Male,secret3,extra\n"
+        b"Ada,Again,ada@example.com,Female,secret4\n"
+        b"Old,User,taken@example.com,Male,secret5\n"
+        b"Alan,Turing,alan@example.com,Male,secret6\n"
+    )
+
+    report = await AuthService.bulk_register_candidates(upload(content))
+
+    assert [row["status"] for row in report["rows"]] == [
+        "created", "invalid", "invalid", "duplicate", "duplicate", "created",
+    ]
+    assert (report["created"], report["duplicates"], report["invalid"]) == (2, 2, 2)
+    assert await database.users.count_documents({}) == 3
+    assert await database.candidate_profiles.count_documents({}) == 2
+
+
+@pytest.mark.anyio
+async def test_undecodable_row_stops_the_import_with_a_report(database, monkeypatch):
+    monkeypatch.setattr("services.auth.BULK_IMPORT_BATCH_SIZE", 2)
+    content = HEADER + (
+        b"Ada,Lovelace,ada@example.com,Female,secret1\n"
+        b"Alan,Turing,alan@example.com,Male,secret2\n"
+        b"Gr\xe9ce,Hopper,grace@example.com,Female,secret3\n"
+        b"Never,Read,never@example.com,Male,secret4\n"
+    )
+
+    report = await AuthService.bulk_register_candidates(upload(content))
+
+    assert [(row["row"], row["status"]) for row in report["rows"]] == [(1, "created"), (2, "created"), (3, "invalid")]
+    assert await database.users.count_documents({"email": "never@example.com"}) == 0
+
+
+@pytest.mark.anyio
+async def test_jsonl_rows_that_are_not_objects_are_invalid(database):
+    content = b'{"first_name": "Ada", "last_name": "L", "email": "ada@example.com", "gender": "Female", ' \
+              b'"password": "secret"}\n\n[1, 2]\nnot json\n'
+
+    report = await AuthService.bulk_register_candidates(upload(content, "candidates.jsonl"))
+
+    assert [(row["row"], row["status"]) for row in report["rows"]] == [(1, "created"), (3, "invalid"), (4, "invalid")]
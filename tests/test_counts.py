@@ -0,0 +1,40 @@
+import pytest
+
+from core.metrics import metrics
+from models.pagination import CountModeEnum
+from services.paginate import count_total
+
+
+@pytest.fixture
+async def job_posts(database):
+    await database.job_posts.insert_many([{"region": "Eastern" if index % 3 else "Western"} for index in range(9)])
+    return database.job_posts
+
+
+@pytest.mark.anyio
+async def test_auto_mode_estimates_unfiltered_totals(job_posts):
+    assert await count_total(job_posts, {}) == (9, False)
+
+
+@pytest.mark.anyio
+async def test_auto_mode_counts_filtered_totals_once_then_reuses_them(job_posts):
+    hits = metrics.snapshot()["counters"].get("count_cache.hits", 0)
+
+    assert await count_total(job_posts, {"region": "Western"}) == (3, True)
+    await job_posts.insert_one({"region": "Western"})
+    assert await count_total(job_posts, {"region": "Western"}) == (3, False)
+    assert metrics.snapshot()["counters"]["count_cache.hits"] == hits + 1
+
+
+@pytest.mark.anyio
+async def test_exact_mode_always_counts(job_posts):
+    await count_total(job_posts, {"region": "Western"})
+    await job_posts.insert_one({"region": "Western"})
+
+    assert await count_total(job_posts, {"region": "Western"}, CountModeEnum.EXACT) == (4, True)
+    assert await count_total(job_posts, {}, CountModeEnum.EXACT) == (10, True)
+
+
+@pytest.mark.anyio
+async def test_none_mode_skips_counting(job_posts):
+    assert await count_total(job_posts, {"region": "Western"}, CountModeEnum.NONE) == (None, False)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+from bson import ObjectId
+
+from models.candidate import ContractTypeEnum, DesiredSalaryEnum, ExperienceLevelEnum, RegionEnum
+from services.candidate import CandidateService
+from services.job_catalog import job_catalog
+from services.job_search_cache import job_search_cache
+
+FILTERS = [
+    {},
+    {"region": RegionEnum.EASTERN},
+    {"region": RegionEnum.EASTERN, "experience_level": ExperienceLevelEnum.NO_EXPERIENCE},
+    {"offered_salary": DesiredSalaryEnum.UNDER_300K, "job_type": ContractTypeEnum.PERMANENT},
+]
+
+
+def job_post(generator: random.Random) -> dict:
+    return {
+        "_id": ObjectId(),
+        "region": generator.choice([RegionEnum.EASTERN.value, RegionEnum.WESTERN.value]),
+        "experience_level": generator.choice([level.value for level in ExperienceLevelEnum][:2]),
+        "offered_salary": generator.choice([salary.value for salary in DesiredSalaryEnum][:2]),
+        "job_type": generator.choice([ContractTypeEnum.PERMANENT.value, ContractTypeEnum.FIXED_TERM.value]),
+    }
+
+
+async def search(page=1, after=None, facets=False, **filters):
+    # Each search computes its response, whichever of the catalog or MongoDB serves it
+    job_search_cache.invalidate()
+    arguments = {"region": None, "city": None, "experience_level": None, "job_ad_title": None,
+                 "offered_salary": None}
+    response = await CandidateService.get_jobs_posted(page, 10, **{**arguments, **filters}, after=after,
+                                                      facets=facets)
+    return [job["_id"] for job in response["jobs"]], response["total_jobs"], response.get("facets")
+
+
+@pytest.fixture
+async def job_posts(database):
+    generator = random.Random(7)
+    await database.job_posts.insert_many([job_post(generator) for _ in range(120)])
+    return database.job_posts
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("filters", FILTERS)
+async def test_catalog_serves_the_same_pages_as_mongodb(job_posts, filters):
+    from_mongodb = [await search(page=page, facets=True, **filters) for page in (1, 2)]
+    cursor_page = await search(after=None, **filters)
+
+    await job_catalog.sync(job_posts)
+    assert job_catalog.can_filter({field: value.value for field, value in filters.items()})
+
+    assert [await search(page=page, facets=True, **filters) for page in (1, 2)] == from_mongodb
+    assert await search(**filters) == cursor_page
+
+
+@pytest.mark.anyio
+async def test_catalog_cursor_pages_follow_id_order(job_posts):
+    await job_catalog.sync(job_posts)
+    region = RegionEnum.EASTERN
+    expected = [post["_id"] async for post in job_posts.find({"region": region.value}).sort("_id", 1)]
+
+    seen, after = [], None
+    while True:
+        job_search_cache.invalidate()
+        response = await CandidateService.get_jobs_posted(1, 10, region, None, None, None, None, after=after)
+        seen.extend(job["_id"] for job in response["jobs"])
+        after = response["next_cursor"]
+        if after is None:
+            break
+
+    assert seen == expected
+
+
+@pytest.mark.anyio
+async def test_sync_picks_up_posts_committed_out_of_id_order(job_posts):
+    older = ObjectId()
+    await job_catalog.sync(job_posts)
+    newer = job_post(random.Random(1))
+    await job_posts.insert_one(newer)
+    await job_catalog.sync(job_posts)
+
+    await job_posts.insert_one({**job_post(random.Random(2)), "_id": older})
+    await job_catalog.sync(job_posts)
+
+    assert len(job_catalog) == 122
+    assert job_catalog._ids == sorted(job_catalog._ids)
@@ -0,0 +1,61 @@
+import pytest
+from bson import ObjectId
+
+from core.metrics import metrics
+from models.candidate import ContractTypeEnum, DesiredSalaryEnum, EducationLevelEnum, ExperienceLevelEnum, \
+    FluencyLevelEnum, RegionEnum, SpokenLanguage
+from models.employer import IndustryEnum
+from models.job_post import JobPost, RemoteWorkEnum, TeamManagementEnum
+from services.candidate import CandidateService
+from services.employer import EmployerService
+
+
+def new_job_post(title: str) -> JobPost:
+    return JobPost(
+        job_ad_title=title,
+        number_of_positions=1,
+        job_description="Build and run the services",
+        required_profile_description="Python",
+        sector=list(IndustryEnum)[0],
+        job_category="Engineering",
+        experience_level=ExperienceLevelEnum.NO_EXPERIENCE,
+        languages_required=[SpokenLanguage(language="English", fluency=list(FluencyLevelEnum)[0])],
+        education_level_required=list(EducationLevelEnum)[0],
+        job_type=ContractTypeEnum.PERMANENT,
+        region=RegionEnum.EASTERN,
+        remote_work=RemoteWorkEnum.NO,
+        team_management=TeamManagementEnum.NO,
+        key_skills=["python"],
+        offered_salary=DesiredSalaryEnum.UNDER_300K,
+    )
+
+
+def counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+async def search_eastern_jobs():
+    return await CandidateService.get_jobs_posted(1, 10, RegionEnum.EASTERN, None, None, None, None)
+
+
+@pytest.mark.anyio
+async def test_repeated_searches_are_served_from_the_cache(database):
+    hits = counter("job_search_cache.hits")
+
+    first = await search_eastern_jobs()
+    await database.job_posts.insert_one({"region": RegionEnum.EASTERN.value})
+
+    assert await search_eastern_jobs() is first
+    assert counter("job_search_cache.hits") == hits + 1
+
+
+@pytest.mark.anyio
+async def test_creating_a_job_post_invalidates_the_cached_searches(database):
+    employer = {"_id": ObjectId(), "role": "employer"}
+    await EmployerService.create_job_post(new_job_post("Backend developer"), employer)
+    assert (await search_eastern_jobs())["total_jobs"] == 1
+
+    await EmployerService.create_job_post(new_job_post("Data engineer"), employer)
+    response = await search_eastern_jobs()
+
+    assert [job["job_ad_title"] for job in response["jobs"]] == ["Backend developer", "Data engineer"]
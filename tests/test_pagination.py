@@ -0,0 +1,48 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from models.pagination import CountModeEnum
+from services.paginate import PaginationService, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    last_id = ObjectId()
+
+    assert decode_cursor(encode_cursor(last_id)) == last_id
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "AAAA", encode_cursor(ObjectId()) + "AA"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_cursor_pages_cover_the_collection_once_in_id_order(database):
+    await database.job_posts.insert_many([{"position": position} for position in range(25)])
+
+    seen = []
+    page = await PaginationService.get_paginated_data(database.job_posts, limit=10, count=CountModeEnum.NONE)
+    while True:
+        seen.extend(document["position"] for document in page["data"])
+        if page["next_cursor"] is None:
+            break
+        page = await PaginationService.get_paginated_data(database.job_posts, limit=10, after=page["next_cursor"],
+                                                          count=CountModeEnum.NONE)
+
+    assert seen == list(range(25))
+    assert page["current_page"] is None
+
+
+@pytest.mark.anyio
+async def test_page_and_cursor_address_the_same_documents(database):
+    await database.job_posts.insert_many([{"position": position} for position in range(25)])
+
+    first = await PaginationService.get_paginated_data(database.job_posts, limit=10, page=1)
+    second = await PaginationService.get_paginated_data(database.job_posts, limit=10, page=2)
+    after_first = await PaginationService.get_paginated_data(database.job_posts, limit=10, after=first["next_cursor"])
+
+    assert after_first["data"] == second["data"]
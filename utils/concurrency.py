@@ -0,0 +1,27 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from core.config import settings
+
+_DEFAULT = object()
+
+
+async def gather(*awaitables, timeout: float | None = _DEFAULT):
+    """Run independent queries concurrently and return their results in order.
+
+    The first failure cancels the queries still running and is raised. Past `timeout` seconds (query_timeout_seconds
+    by default, None to wait forever) they are all cancelled and the request fails with a 504.
+    """
+    if timeout is _DEFAULT:
+        timeout = settings.query_timeout_seconds
+
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="The database took too long to respond")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,49 @@
+import functools
+from typing import Any
+
+import orjson
+from bson import Decimal128, ObjectId
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+
+
+def bson_default(value):
+    """The BSON types orjson doesn't know about, datetimes and enums are encoded natively."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps_bson(content: Any, option: int = 0) -> bytes:
+    return orjson.dumps(content, default=bson_default, option=orjson.OPT_NON_STR_KEYS | option)
+
+
+class BSONJSONResponse(JSONResponse):
+    """JSON response encoding the documents as returned by Motor, in a single pass."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bson(content)
+
+
+def bson_endpoint(endpoint, status_code):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, Response):
+            return result
+        return BSONJSONResponse(result, status_code=status_code or 200)
+
+    return wrapper
+
+
+class BSONRoute(APIRoute):
+    """Route serving the endpoint result through BSONJSONResponse.
+
+    FastAPI hands a returned Response as is to the client, which skips its jsonable_encoder walk over the content.
+    The endpoints therefore return plain dicts and lists, there is no response_model to validate against.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, bson_endpoint(endpoint, kwargs.get("status_code")), **kwargs)